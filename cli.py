@@ -1,17 +1,48 @@
 #!/usr/bin/env python3
-import argparse
 import sys
-import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import threading
-from src.parser import tokenize_command
-from src.knowledge_base import COMMAND_KNOWLEDGE_BASE
-from src.danger_detector import detect_dangerous_patterns
-from src.man_parser import get_command_help, get_command_details
-from src.custom_commands import load_custom_commands, add_custom_command
-from src.regex_explainer import looks_like_regex, explain_regex
-from src.signals import explain_signal_flag
+import os
+import io
+import re
+import _thread
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
+from types import SimpleNamespace
+
+# Characters without which looks_like_regex() can never report a regex
+REGEX_METACHARACTERS = frozenset('.*+?|()[]{}^$\\')
+
+# Operators that separate the commands of a command line
+CONTROL_OPERATORS = frozenset(('|', '&&', '||', ';'))
+
+# Knowledge-base danger levels that produce a risk warning
+HIGH_RISK_LEVELS = frozenset(('high', 'critical'))
+
+# Commands whose args are explained as signals
+KILL_COMMANDS = frozenset(('kill', 'killall'))
+
+# find tokens that belong to -exec rather than being arguments
+FIND_EXEC_TOKENS = frozenset(('{}', ';'))
+
+# Output redirections, optionally prefixed with a one- or two-digit file
+# descriptor such as 2 or 10 (zero-padded forms like 02 included)
+REDIRECTION_OPERATORS = frozenset(
+    fd + op
+    for fd in ["", *(str(n) for n in range(10)), *(f"{n:02d}" for n in range(100))]
+    for op in ('>', '>>')
+)
+
+# Commands whose positional args get a dedicated explanation
+POSITIONAL_COMMANDS = frozenset(('find', 'grep', 'chmod', 'chown', 'echo'))
+
+# Octal chmod modes like 755 or 0644
+OCTAL_MODE_RE = re.compile(r"0?[0-7]{3}")
+
+# Characters auto_escape_command may escape; strings without any are returned as is
+ESCAPABLE_CHARACTERS = frozenset('$"`\\')
+# Unescaped $, " and ` characters for auto_escape_command
+_UNESCAPED_SPECIAL_RE = re.compile(r'(?<!\\)([$"`])')
+# Unescaped backslashes that aren't already escaping something
+_UNESCAPED_BACKSLASH_RE = re.compile(r'(?<!\\)\\(?!["$`\\])')
 
 # Color codes for professional output
 class Colors:
@@ -31,9 +62,42 @@ class Colors:
     BOLD = '\033[1m'
     DIM = '\033[2m'
 
+@lru_cache(maxsize=1)
+def _build_kb(mtime):
+    """Build the combined knowledge base; custom commands shadow built-in ones."""
+    from src.knowledge_base import COMMAND_KNOWLEDGE_BASE
+    from src.custom_commands import load_custom_commands
+    return ChainMap(load_custom_commands(), COMMAND_KNOWLEDGE_BASE)
+
+def _knowledge_base_mtime():
+    """Return the custom knowledge-base file's mtime, or None if it is missing."""
+    # The knowledge-base modules (and json) are only imported when needed, so
+    # --help and --api startup skip them
+    from src.custom_commands import KNOWLEDGE_BASE_PATH
+    try:
+        return os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+def get_knowledge_base():
+    """Return the combined knowledge base, rebuilt only when the custom file changes."""
+    return _build_kb(_knowledge_base_mtime())
+
+# The last sys.stdout checked and whether it is a terminal; isatty() is a
+# system call and the colorize helpers run for every fragment of output
+_stdout_tty = (None, False)
+
+def _stdout_is_tty():
+    """Return sys.stdout.isatty(), checked once per stdout object."""
+    global _stdout_tty
+    stream = sys.stdout
+    if _stdout_tty[0] is not stream:
+        _stdout_tty = (stream, stream.isatty())
+    return _stdout_tty[1]
+
 def colorize(text, color):
     """Apply color to text if terminal supports it."""
-    if not sys.stdout.isatty():
+    if not _stdout_is_tty():
         return text  # No colors if not a terminal
     return f"{color}{text}{Colors.RESET}"
 
@@ -47,74 +111,116 @@ def set_no_color(disable):
 
 def colorize_with_flag(text, color):
     """Apply color to text if colors are enabled and terminal supports it."""
-    if NO_COLOR or not sys.stdout.isatty():
+    if NO_COLOR or not _stdout_is_tty():
         return text  # No colors if disabled or not a terminal
     return f"{color}{text}{Colors.RESET}"
 
 def print_header(command):
     """Print a professional command header."""
-    print(f"\n{colorize_with_flag('Command:', Colors.META)} {colorize_with_flag(command, Colors.COMMAND)}")
-    print(f"{colorize_with_flag('─' * (len(command) + 10), Colors.META)}")
+    sys.stdout.write(
+        f"\n{colorize_with_flag('Command:', Colors.META)} {colorize_with_flag(command, Colors.COMMAND)}\n"
+        f"{colorize_with_flag('─' * (len(command) + 10), Colors.META)}\n"
+    )
+
+def _line_colors():
+    """Return the (flag, command, description, reset) codes; all empty when colors are off."""
+    if NO_COLOR or not _stdout_is_tty():
+        return "", "", "", ""
+    return Colors.FLAG, Colors.COMMAND, Colors.DESCRIPTION, Colors.RESET
+
+def format_explanation_line(line):
+    """Colorize one explanation line for terminal output."""
+    # Resolved once per line, then each line is a single f-string
+    flag_color, command_color, desc_color, reset = _line_colors()
+    if line.startswith("  "):
+        # Indented line (flag or argument)
+        if ":" in line and not line.strip().endswith(":"):
+            # Has a colon (flag: description)
+            flag_part, desc_part = line.split(":", 1)
+            return f"  {flag_color}{flag_part.strip()}{reset}: {desc_color}{desc_part.strip()}{reset}"
+        # Regular indented line
+        return f"{desc_color}{line}{reset}"
+    # Main command line
+    if ":" in line and not line.strip().endswith(":"):
+        cmd_part, desc_part = line.split(":", 1)
+        return f"{command_color}{cmd_part.strip()}{reset}: {desc_color}{desc_part.strip()}{reset}"
+    return f"{command_color}{line}{reset}"
 
 def print_explanation(explanation, warnings):
     """Print explanations with professional formatting."""
     if not explanation:
         return
     
-    print(f"\n{colorize_with_flag('Explanation:', Colors.META)}")
-    
+    # Format into one buffer and write it once rather than printing per line
+    out = io.StringIO()
+    write = out.write
+    write(f"\n{colorize_with_flag('Explanation:', Colors.META)}\n")
     for line in explanation:
-        if line.startswith("  "):
-            # Indented line (flag or argument)
-            if ":" in line and not line.strip().endswith(":"):
-                # Has a colon (flag: description)
-                parts = line.split(":", 1)
-                flag_part = parts[0].strip()
-                desc_part = parts[1].strip()
-                
-                # Colorize flag and description
-                colored_flag = colorize_with_flag(flag_part, Colors.FLAG)
-                colored_desc = colorize_with_flag(desc_part, Colors.DESCRIPTION)
-                print(f"  {colored_flag}: {colored_desc}")
-            else:
-                # Regular indented line
-                print(f"{colorize_with_flag(line, Colors.DESCRIPTION)}")
-        else:
-            # Main command line
-            if ":" in line and not line.strip().endswith(":"):
-                parts = line.split(":", 1)
-                cmd_part = parts[0].strip()
-                desc_part = parts[1].strip()
-                
-                colored_cmd = colorize_with_flag(cmd_part, Colors.COMMAND)
-                colored_desc = colorize_with_flag(desc_part, Colors.DESCRIPTION)
-                print(f"{colored_cmd}: {colored_desc}")
-            else:
-                print(f"{colorize_with_flag(line, Colors.COMMAND)}")
+        write(format_explanation_line(line))
+        write("\n")
+    sys.stdout.write(out.getvalue())
+
+class ExplanationPrinter:
+    """List-like sink for analyze_command that prints each line as it is added.
+
+    The "Explanation:" heading is written before the first line, so nothing is
+    printed for a command without explanation lines.
+    """
+
+    def __init__(self):
+        self.started = False
+
+    def append(self, line):
+        if not self.started:
+            sys.stdout.write(f"\n{colorize_with_flag('Explanation:', Colors.META)}\n")
+            self.started = True
+        sys.stdout.write(format_explanation_line(line) + "\n")
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
 
 def print_warnings(warnings):
     """Print warnings with professional formatting."""
     if warnings:
-        print(f"\n{colorize_with_flag('Warnings:', Colors.WARNING)}")
+        # Build the whole block and write it once rather than printing per line
+        bullet = colorize_with_flag('*', Colors.WARNING)
+        lines = [f"\n{colorize_with_flag('Warnings:', Colors.WARNING)}"]
         for warning in warnings:
-            print(f"  {colorize_with_flag('*', Colors.WARNING)} {colorize_with_flag(warning, Colors.DESCRIPTION)}")
+            lines.append(f"  {bullet} {colorize_with_flag(warning, Colors.DESCRIPTION)}")
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+
+# Explanations for control operators
+OPERATOR_DESCRIPTIONS = {
+    '&&': "Execute next command only if previous command succeeds",
+    '||': "Execute next command only if previous command fails",
+    ';': "Execute next command regardless of previous command's result",
+    '|': "Pipe the output of the previous command as input to the next command",
+}
+
+# Display symbols for control operators
+OPERATOR_SYMBOLS = {
+    '|': '|',
+    '&&': '&&',
+    '||': '||',
+    ';': ';'
+}
 
 def print_pipe_operator(op):
     """Print pipe operators with special formatting."""
-    op_symbols = {
-        '|': '|',
-        '&&': '&&',
-        '||': '||',
-        ';': ';'
-    }
-    symbol = op_symbols.get(op, op)
+    symbol = OPERATOR_SYMBOLS.get(op, op)
     return f"{colorize_with_flag(symbol, Colors.META)}"
 
 def truncate_description(description, max_length=100):
     """Truncate overly long descriptions to keep output readable."""
     if len(description) <= max_length:
         return description
-    
+    return _truncate_long_description(description, max_length)
+
+@lru_cache(maxsize=4096)
+def _truncate_long_description(description, max_length):
+    """Truncate a description longer than max_length; flag descriptions recur, so results are cached."""
     # Find a good break point (end of sentence or comma)
     truncated = description[:max_length]
     for break_char in ['. ', ', ', '; ']:
@@ -135,192 +241,94 @@ def handle_repeated_flags(flag, count):
 
 def auto_escape_command(command_string):
     """Automatically escape special characters in command strings for better parsing."""
-    import re
-    
     # Don't escape if already properly quoted
     if (command_string.startswith('"') and command_string.endswith('"')) or \
        (command_string.startswith("'") and command_string.endswith("'")):
         return command_string
     
-    # Escape dollar signs that aren't already escaped
-    command_string = re.sub(r'(?<!\\)\$', r'\\$', command_string)
-    
-    # Escape unescaped double quotes
-    command_string = re.sub(r'(?<!\\)"', r'\\"', command_string)
+    # Most commands have nothing to escape; skip both substitutions
+    if ESCAPABLE_CHARACTERS.isdisjoint(command_string):
+        return command_string
     
-    # Escape unescaped backticks
-    command_string = re.sub(r'(?<!\\)`', r'\\`', command_string)
+    # Escape unescaped dollar signs, double quotes and backticks in one pass
+    command_string = _UNESCAPED_SPECIAL_RE.sub(r'\\\1', command_string)
     
     # Escape unescaped backslashes that aren't already escaping something
     # This is tricky - we need to be careful not to double-escape
-    command_string = re.sub(r'(?<!\\)\\(?!["$`\\])', r'\\\\', command_string)
+    command_string = _UNESCAPED_BACKSLASH_RE.sub(r'\\\\', command_string)
     
     return command_string
 
-def parse_combined_flags(arg, flags):
-    """Parse combined flags like -vv, -sC, -sV, etc."""
-    if not arg.startswith('-') or len(arg) < 2:
+def short_flag_table(flags):
+    """Index single-character short flags by their character, e.g. {'l': desc of -l}."""
+    return {flag[1]: desc for flag, desc in flags.items() if len(flag) == 2 and flag[0] == '-'}
+
+def cluster_prefix_lengths(flags):
+    """Lengths of single-dash flags longer than one letter (like -sC), longest first."""
+    return tuple(sorted({len(flag) for flag in flags if len(flag) > 2 and flag[0] == '-' and flag[1] != '-'}, reverse=True))
+
+def parse_combined_flags(arg, flags, short_flags=None, prefix_lengths=None):
+    """Parse combined flags like -vv, -sC, -sV, etc.
+
+    `short_flags` and `prefix_lengths` are the short_flag_table() and
+    cluster_prefix_lengths() of `flags`; pass them in when parsing several
+    args against the same flags to avoid rebuilding them.
+    """
+    if arg[:1] != '-' or len(arg) < 2:
         return []
     
     # Check for exact match first
     if arg in flags:
         return [(arg, flags[arg])]
     
+    if short_flags is None:
+        short_flags = short_flag_table(flags)
+    
     # Handle repeated single flags like -vv, -vvv
-    if len(arg) > 2 and len(set(arg[1:])) == 1:  # All characters are the same
-        char = arg[1]
-        single_flag = f"-{char}"
-        if single_flag in flags:
+    if len(arg) > 2 and arg[2:] == arg[1] * (len(arg) - 2):  # All characters are the same
+        desc = short_flags.get(arg[1])
+        if desc is not None:
             count = len(arg) - 1
-            return [(arg, f"{flags[single_flag]} (repeated {count} times)")]
+            return [(arg, f"{desc} (repeated {count} times)")]
     
     # Handle combined flags like -sC, -sV
     if len(arg) > 2:
+        if arg[1] == '-':
+            lengths = range(len(arg) - 1, 1, -1)
+        else:
+            # Only lengths some multi-letter flag has can match; a two-letter
+            # prefix match is the same as the per-character fallback below
+            if prefix_lengths is None:
+                prefix_lengths = cluster_prefix_lengths(flags)
+            lengths = prefix_lengths
         # Try to find the longest matching prefix
-        for i in range(len(arg) - 1, 1, -1):
+        for i in lengths:
+            if i >= len(arg):
+                continue
             prefix = arg[:i]
             if prefix in flags:
-                remaining = arg[i:]
                 results = [(prefix, flags[prefix])]
                 # Parse remaining characters
-                for char in remaining:
-                    single_flag = f"-{char}"
-                    if single_flag in flags:
-                        results.append((single_flag, flags[single_flag]))
+                results.extend(expand_short_flags(arg[i:], short_flags))
                 return results
     
     # Fall back to individual character parsing
+    return expand_short_flags(arg[1:], short_flags)
+
+def expand_short_flags(chars, short_flags):
+    """Return (flag, description) pairs for each known short flag character in `chars`."""
     results = []
-    for char in arg[1:]:
-        single_flag = f"-{char}"
-        if single_flag in flags:
-            results.append((single_flag, flags[single_flag]))
-    
+    for char in chars:
+        desc = short_flags.get(char)
+        if desc is not None:
+            results.append((f"-{char}", desc))
     return results
 
-class ExplainAPIHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for the explain-cli API server."""
-    
-    def __init__(self, knowledge_base, *args, **kwargs):
-        self.knowledge_base = knowledge_base
-        super().__init__(*args, **kwargs)
-    
-    def do_GET(self):
-        """Handle GET requests - return API documentation."""
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            api_info = {
-                "name": "explain-cli API",
-                "version": "1.0.0",
-                "description": "RESTful API for shell command explanation and analysis",
-                "endpoints": {
-                    "POST /explain": {
-                        "description": "Analyze and explain shell commands with flag descriptions and security warnings",
-                        "parameters": {
-                            "command": "Shell command to explain (required, string)",
-                            "no_auto_escape": "Disable automatic character escaping (optional, boolean, default: false)",
-                            "no_color": "Disable colored output formatting (optional, boolean, default: true)"
-                        },
-                        "response": {
-                            "command": "Original command string",
-                            "escaped_command": "Auto-escaped version (if applicable)",
-                            "explanation": "Array of explanation lines",
-                            "warnings": "Array of security warnings",
-                            "success": "Boolean indicating success"
-                        }
-                    },
-                    "GET /": "API documentation and usage information"
-                },
-                "usage_examples": {
-                    "curl": "curl -X POST http://localhost:8080/explain -H 'Content-Type: application/json' -d '{\"command\": \"ls -la\"}'",
-                    "python": "import requests; response = requests.post('http://localhost:8080/explain', json={'command': 'ls -la'}); print(response.json())",
-                    "javascript": "fetch('http://localhost:8080/explain', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({command: 'ls -la'})}).then(r => r.json()).then(console.log)"
-                },
-                "error_codes": {
-                    "400": "Bad Request - Invalid JSON or missing required fields",
-                    "404": "Not Found - Invalid endpoint",
-                    "500": "Internal Server Error - Processing error"
-                }
-            }
-            
-            self.wfile.write(json.dumps(api_info, indent=2).encode())
-        else:
-            self.send_error(404, "Not Found")
-    
-    def do_POST(self):
-        """Handle POST requests - explain commands."""
-        if self.path == '/explain':
-            try:
-                # Read request body
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                
-                # Parse JSON
-                try:
-                    data = json.loads(post_data.decode('utf-8'))
-                except json.JSONDecodeError:
-                    self.send_error(400, "Invalid JSON")
-                    return
-                
-                # Validate required fields
-                if 'command' not in data:
-                    self.send_error(400, "Missing required field: command")
-                    return
-                
-                command = data['command']
-                no_auto_escape = data.get('no_auto_escape', False)
-                no_color = data.get('no_color', True)  # Default to no color for API
-                
-                # Validate input length
-                if len(command) > 10000:
-                    self.send_error(400, "Command string too long (max 10000 characters)")
-                    return
-                
-                # Process the command
-                result = process_command_explanation(command, no_auto_escape, no_color, self.knowledge_base)
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-                self.end_headers()
-                
-                self.wfile.write(json.dumps(result, indent=2).encode())
-                
-            except Exception as e:
-                self.send_error(500, f"Internal server error: {str(e)}")
-        else:
-            self.send_error(404, "Not Found")
-    
-    def do_OPTIONS(self):
-        """Handle CORS preflight requests."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-    
-    def log_message(self, format, *args):
-        """Override to reduce log verbosity."""
-        pass
-
-def create_api_handler(knowledge_base):
-    """Create an API handler with the knowledge base."""
-    def handler(*args, **kwargs):
-        return ExplainAPIHandler(knowledge_base, *args, **kwargs)
-    return handler
+def _explain(command_string, no_auto_escape, knowledge_base):
+    """Return (escaped_command, explanation, warnings) for a command string."""
+    from src.parser import tokenize_command
+    from src.danger_detector import detect_dangerous_patterns
 
-def process_command_explanation(command_string, no_auto_escape=False, no_color=True, knowledge_base=None):
-    """Process a command explanation and return structured data."""
-    if knowledge_base is None:
-        custom_commands = load_custom_commands()
-        knowledge_base = {**COMMAND_KNOWLEDGE_BASE, **custom_commands}
-    
     # Auto-escape special characters for better parsing (unless disabled)
     if no_auto_escape:
         escaped_command = command_string
@@ -332,14 +340,35 @@ def process_command_explanation(command_string, no_auto_escape=False, no_color=T
     explanation, analysis_warnings = analyze_command(tokens, knowledge_base)
     danger_warnings = detect_dangerous_patterns(command_string, tokens)
     
-    all_warnings = analysis_warnings + danger_warnings
+    return escaped_command, explanation, analysis_warnings + danger_warnings
+
+@lru_cache(maxsize=1024)
+def _explain_cached(command_string, no_auto_escape, kb_mtime):
+    """_explain against the default knowledge base, as tuples.
+
+    Keyed on the custom file's mtime, so --add-command invalidates entries.
+    """
+    escaped_command, explanation, warnings = _explain(command_string, no_auto_escape, _build_kb(kb_mtime))
+    return escaped_command, tuple(explanation), tuple(warnings)
+
+def process_command_explanation(command_string, no_auto_escape=False, no_color=True, knowledge_base=None):
+    """Process a command explanation and return structured data."""
+    # API clients send arbitrary JSON; a bool is a valid cache key and keeps
+    # 1 and True from being cached separately
+    no_auto_escape = bool(no_auto_escape)
+    if knowledge_base is None:
+        # Repeated commands (e.g. from an API client) are answered from the cache
+        escaped_command, explanation, all_warnings = _explain_cached(
+            command_string, no_auto_escape, _knowledge_base_mtime())
+    else:
+        escaped_command, explanation, all_warnings = _explain(command_string, no_auto_escape, knowledge_base)
     
     # Structure the response
     result = {
         "command": command_string,
         "escaped_command": escaped_command if escaped_command != command_string else None,
-        "explanation": explanation,
-        "warnings": all_warnings,
+        "explanation": list(explanation),
+        "warnings": list(all_warnings),
         "success": True
     }
     
@@ -347,69 +376,306 @@ def process_command_explanation(command_string, no_auto_escape=False, no_color=T
 
 def start_api_server(host='localhost', port=8080, knowledge_base=None):
     """Start the API server."""
-    if knowledge_base is None:
-        custom_commands = load_custom_commands()
-        knowledge_base = {**COMMAND_KNOWLEDGE_BASE, **custom_commands}
-    
-    handler_class = create_api_handler(knowledge_base)
-    server = HTTPServer((host, port), handler_class)
-    
-    print(f"explain-cli API server starting on http://{host}:{port}")
-    print(f"API documentation available at http://{host}:{port}")
-    print(f"Example usage: curl -X POST http://{host}:{port}/explain -H 'Content-Type: application/json' -d '{{\"command\": \"ls -la\"}}'")
-    print("Press Ctrl+C to stop the server")
+    # http.server pulls in email/ssl/socket; only pay for it in --api mode
+    from src.api_server import start_api_server as _start_api_server
+
+    # With no knowledge base given, each request uses the current default one
+    # and is served from process_command_explanation's cache
+    _start_api_server(host, port, knowledge_base, process_command_explanation)
+
+# Argument kinds from classify_arg
+ARG_PLAIN, ARG_SHORT, ARG_CLUSTER, ARG_LONG = range(4)
+
+def classify_arg(arg):
+    """Classify an argument once: plain value, short flag, flag cluster or long flag."""
+    prefix = arg[:2]
+    if prefix == "--":
+        return ARG_LONG
+    if prefix[:1] == "-":
+        return ARG_CLUSTER if len(arg) > 2 else ARG_SHORT
+    return ARG_PLAIN
+
+# Most commands whose flag tables _cached_flag_tables keeps; the same bound
+# as get_command_details' cache, whose flags dicts the entries refer to
+FLAG_TABLE_CACHE_SIZE = 256
+
+# command -> (flags, short_flag_table, cluster_prefix_lengths), least
+# recently used first
+_FLAG_TABLES = OrderedDict()
+# API server threads share _FLAG_TABLES; reordering and eviction must not interleave
+_flag_tables_lock = _thread.allocate_lock()
+
+def _cached_flag_tables(command, flags):
+    """Return (short_flag_table, cluster_prefix_lengths) of flags, built once per command and flags dict.
+
+    The tables are reused only while the same flags dict is passed in and
+    are rebuilt for any other dict. For known commands that is the
+    _merged_flags result, which is a new dict once the knowledge-base entry
+    or the details object changes. Otherwise it is the details' own flags
+    dict. At most FLAG_TABLE_CACHE_SIZE commands are kept, so arbitrary
+    command names from API clients can't grow it without bound.
+    """
+    with _flag_tables_lock:
+        cached = _FLAG_TABLES.get(command)
+        if cached is not None and cached[0] is flags:
+            _FLAG_TABLES.move_to_end(command)
+            return cached[1], cached[2]
+    short_flags = short_flag_table(flags)
+    prefix_lengths = cluster_prefix_lengths(flags)
+    with _flag_tables_lock:
+        _FLAG_TABLES[command] = (flags, short_flags, prefix_lengths)
+        _FLAG_TABLES.move_to_end(command)
+        if len(_FLAG_TABLES) > FLAG_TABLE_CACHE_SIZE:
+            _FLAG_TABLES.popitem(last=False)
+    return short_flags, prefix_lengths
+
+def _parse_flags(command, args, flags, subcommands=None):
+    """Explain the flags (and subcommands, if given) found in `args`.
+
+    Returns (lines, consumed) where `consumed` holds the indices of args that
+    were taken as flag values and are therefore not positional arguments.
+    """
+    lines = []
+    consumed = set()
+    signal_lines = []
+    subcommands = subcommands or {}
+    short_flags = prefix_lengths = None
+    is_kill = command in KILL_COMMANDS
+    if is_kill:
+        from src.signals import explain_signal_flag
+    # find is parsed specially later; kill-like commands only consume `-s VALUE`
+    skip_long_values = not is_kill and command != "find"
+    kinds = [classify_arg(arg) for arg in args]
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        kind = kinds[i]
+        # Whether the next arg can be this flag's value
+        has_value = i + 1 < len(args) and kinds[i+1] == ARG_PLAIN
+        if is_kill:
+            # Generic signal flag explanations for kill-like commands
+            next_arg = args[i+1] if i + 1 < len(args) else None
+            sig_exp = explain_signal_flag(arg, next_arg)
+            if sig_exp:
+                signal_lines.append(sig_exp)
+                if arg == '-s' and next_arg and has_value:
+                    consumed.add(i+1)
+        if kind == ARG_LONG:
+            name, eq, val = arg.partition('=')
+            if skip_long_values and not (eq and val) and has_value:
+                # The value after a long flag is not a positional argument. Do not
+                # generically consume a value after single-dash short flags; without
+                # per-command metadata this can misclassify positional args
+                consumed.add(i+1)
+            if name in flags:
+                truncated_desc = truncate_description(flags[name])
+                if eq and val:
+                    lines.append(f"  {name}: {truncated_desc} (value: {val})")
+                elif has_value:
+                    lines.append(f"  {name}: {truncated_desc} (value: {args[i+1]})")
+                    i += 1
+                else:
+                    lines.append(f"  {name}: {truncated_desc}")
+        elif kind == ARG_CLUSTER:
+            # Use the new combined flag parser
+            if short_flags is None:
+                short_flags, prefix_lengths = _cached_flag_tables(command, flags)
+            flag_results = parse_combined_flags(arg, flags, short_flags, prefix_lengths)
+            for flag, desc in flag_results:
+                truncated_desc = truncate_description(desc)
+                lines.append(f"  {flag}: {truncated_desc}")
+        elif arg in flags:
+            # Short flag possibly with a following value
+            truncated_desc = truncate_description(flags[arg])
+            if has_value:
+                lines.append(f"  {arg}: {truncated_desc} (value: {args[i+1]})")
+                i += 1
+            else:
+                lines.append(f"  {arg}: {truncated_desc}")
+        elif arg in subcommands:
+            lines.append(f"  {arg}: {subcommands[arg]}")
+        i += 1
+
+    lines.extend(signal_lines)
+    return lines, consumed
+
+def _describe_modified(value, unit):
+    """Describe a find -mtime/-mmin value such as +30, -7 or 5."""
+    sign = value[:1]
+    if sign == '+':
+        return f"find files modified more than {value[1:]} {unit} ago"
+    elif sign == '-':
+        return f"find files modified less than {value[1:]} {unit} ago"
+    return f"find files modified exactly {value} {unit} ago"
+
+_FIND_TYPES = {"f": "regular file", "d": "directory", "l": "symbolic link"}
+
+# Descriptions for find flags followed by a value, keyed by flag
+FIND_VALUE_DESCRIPTIONS = {
+    "-name": lambda value: f"find files matching pattern '{value}'",
+    "-type": lambda value: f"find items of type '{_FIND_TYPES.get(value, value)}'",
+    "-mtime": lambda value: _describe_modified(value, "days"),
+    "-mmin": lambda value: _describe_modified(value, "minutes"),
+    "-size": lambda value: f"find files of size {value}",
+    "-user": lambda value: f"find files owned by user '{value}'",
+    "-group": lambda value: f"find files owned by group '{value}'",
+    "-perm": lambda value: f"find files with permissions {value}",
+    "-exec": lambda value: f"execute command '{value}' on found files",
+}
+
+# Descriptions and warnings for find flags used without a value
+FIND_SWITCH_DESCRIPTIONS = {
+    "-delete": "delete found files (dangerous)",
+    "-print": "print found files (default action)",
+    "-ls": "list found files in long format",
+    "-executable": "find executable files",
+    "-readable": "find readable files",
+    "-writable": "find writable files",
+}
+FIND_SWITCH_WARNINGS = {
+    "-delete": "The -delete flag will permanently remove files",
+}
+
+# Descriptions for the stdout/stderr redirections, keyed by operator
+def _overwrite_stdout(target):
+    return f"redirects the output into a file named {target} (overwrites file if it exists)"
+
+def _append_stdout(target):
+    return f"appends standard output to {target}"
+
+REDIRECTION_DESCRIPTIONS = {
+    ">": _overwrite_stdout,
+    "1>": _overwrite_stdout,
+    ">>": _append_stdout,
+    "1>>": _append_stdout,
+    "2>": lambda target: f"redirects standard error to {target} (overwrites)",
+    "2>>": lambda target: f"appends standard error to {target}",
+}
+# Redirections that get an overwrite warning
+OVERWRITING_REDIRECTIONS = frozenset(('>', '1>'))
+
+def _is_find_value(arg):
+    """Check whether an arg following a find flag is its value rather than another flag."""
+    return (
+        arg[:1] != '-' or                            # Not a flag
+        arg[1:].isdigit() or                         # Negative number like -7
+        arg[:1] == '+' or                            # Positive number like +30
+        arg in FIND_EXEC_TOKENS or                   # Special find tokens
+        (len(arg) > 1 and arg[1] in '0123456789')    # Negative number
+    )
+
+def _explain_find(args, find_flags, indent, explanation, warnings):
+    """Explain find's search path and expression, indenting flag lines by `indent`."""
+    explanation.append(f"  search_path: {args[0]}")
     
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down API server...")
-        server.shutdown()
+    i = 1
+    while i < len(args):
+        arg = args[i]
+        
+        if arg in find_flags:
+            # Handle flags that take values
+            if i + 1 < len(args) and _is_find_value(args[i+1]):
+                value = args[i+1]
+                describe = FIND_VALUE_DESCRIPTIONS.get(arg)
+                if describe is not None:
+                    explanation.append(f"{indent}{arg}: {describe(value)}")
+                else:
+                    explanation.append(f"{indent}{arg}: {find_flags[arg]} (value: {value})")
+                i += 2
+                continue
+            # Flag without value
+            explanation.append(f"{indent}{arg}: {FIND_SWITCH_DESCRIPTIONS.get(arg, find_flags[arg])}")
+            if arg in FIND_SWITCH_WARNINGS:
+                warnings.append(FIND_SWITCH_WARNINGS[arg])
+        elif arg in FIND_EXEC_TOKENS:
+            # Part of -exec / end of the -exec command, skip it
+            pass
+        else:
+            explanation.append(f"{indent}argument: {arg}")
+        i += 1
+
+def _explain_sudo_flags(args, flags, subcommands, explanation):
+    """Explain the flags and subcommands of a command run under sudo."""
+    short_flags = None
+    for arg in args:
+        kind = classify_arg(arg)
+        if kind == ARG_LONG:
+            name, eq, val = arg.partition('=')
+            if name in flags:
+                if eq and val:
+                    explanation.append(f"    {name}: {flags[name]} (value: {val})")
+                else:
+                    explanation.append(f"    {name}: {flags[name]}")
+        elif kind == ARG_CLUSTER:
+            # First check if the entire flag exists (for combined flags like -sC, -sV)
+            if arg in flags:
+                explanation.append(f"    {arg}: {flags[arg]}")
+            else:
+                # If not found as a combined flag, try individual characters
+                if short_flags is None:
+                    short_flags = short_flag_table(flags)
+                for flag, desc in expand_short_flags(arg[1:], short_flags):
+                    explanation.append(f"    {flag}: {desc}")
+        elif arg in flags:
+            explanation.append(f"    {arg}: {flags[arg]}")
+        elif arg in subcommands:
+            explanation.append(f"    {arg}: {subcommands[arg]}")
+
+# command -> (knowledge-base entry, details, merged flags) for _merged_flags
+_MERGED_FLAGS_CACHE = {}
 
-def _analyze_single_command(tokens, knowledge_base):
-    explanation = []
+def _merged_flags(command, command_info, details):
+    """Return a command's knowledge-base flags merged with its help/man flags.
+
+    Dynamic flags take precedence for conflicts. The merge is cached per
+    command and reused only while both the knowledge-base entry and the
+    details are the same objects, so a rebuilt knowledge base or reloaded
+    help/man details never see stale flags. Neither input is mutated.
+    """
+    cached = _MERGED_FLAGS_CACHE.get(command)
+    if cached is not None and cached[0] is command_info and cached[1] is details:
+        return cached[2]
+    merged = {**command_info.get("flags", {}), **details.get("flags", {})}
+    _MERGED_FLAGS_CACHE[command] = (command_info, details, merged)
+    return merged
+
+def _analyze_single_command(tokens, knowledge_base, explanation=None):
+    if explanation is None:
+        explanation = []
     warnings = []
     if not tokens:
         return explanation, warnings
 
+    # Deferred so --add-command and --api startup skip the man parser
+    from src.man_parser import get_command_details
+
+    # Bound once: ChainMap.get is a Python-level method
+    kb_get = knowledge_base.get
     command = tokens[0]
     args = tokens[1:]
     
     # Special handling for sudo - explain both sudo and the command it runs
     if command == "sudo" and args:
         # Explain sudo itself
-        if command in knowledge_base:
-            command_info = knowledge_base[command]
+        command_info = kb_get(command)
+        if command_info is not None:
             explanation.append(f"{command}: {command_info['description']}")
-            if command_info['danger_level'] in ["high", "critical"]:
+            if command_info['danger_level'] in HIGH_RISK_LEVELS:
                 warnings.append(f"The command '{command}' is considered {command_info['danger_level']} risk.")
         
         # Explain the command being run with sudo
         sub_command = args[0]
         sub_args = args[1:]
         
-        if sub_command in knowledge_base:
-            sub_info = knowledge_base[sub_command]
+        sub_info = kb_get(sub_command)
+        if sub_info is not None:
             explanation.append(f"  Executing: {sub_command} - {sub_info['description']}")
-            if sub_info['danger_level'] in ["high", "critical"]:
+            if sub_info['danger_level'] in HIGH_RISK_LEVELS:
                 warnings.append(f"The command '{sub_command}' is considered {sub_info['danger_level']} risk.")
             
             # Explain flags for the sub-command
-            flags = sub_info.get("flags", {})
-            for arg in sub_args:
-                if arg.startswith("--") and arg in flags:
-                    explanation.append(f"    {arg}: {flags[arg]}")
-                elif arg.startswith("-") and len(arg) > 2:
-                    # First check if the entire flag exists (for combined flags like -sC, -sV)
-                    if arg in flags:
-                        explanation.append(f"    {arg}: {flags[arg]}")
-                    else:
-                        # If not found as a combined flag, try individual characters
-                        for char in arg[1:]:
-                            flag = f"-{char}"
-                            if flag in flags:
-                                explanation.append(f"    {flag}: {flags[flag]}")
-                elif arg in flags:
-                    explanation.append(f"    {arg}: {flags[arg]}")
+            _explain_sudo_flags(sub_args, sub_info.get("flags", {}), {}, explanation)
         else:
             # Unknown sub-command - get details from man/help
             details = get_command_details(sub_command)
@@ -417,401 +683,89 @@ def _analyze_single_command(tokens, knowledge_base):
                 explanation.append(f"  Executing: {details['summary']}")
             
             # Explain flags and subcommands for the sub-command
-            flags = details.get("flags", {})
-            subcommands = details.get("subcommands", {})
-            for arg in sub_args:
-                if arg.startswith("--"):
-                    name, eq, val = arg.partition('=')
-                    if name in flags:
-                        if eq and val:
-                            explanation.append(f"    {name}: {flags[name]} (value: {val})")
-                        else:
-                            explanation.append(f"    {name}: {flags[name]}")
-                elif arg.startswith("-") and len(arg) > 2:
-                    # First check if the entire flag exists (for combined flags like -sC, -sV)
-                    if arg in flags:
-                        explanation.append(f"    {arg}: {flags[arg]}")
-                    else:
-                        # If not found as a combined flag, try individual characters
-                        for char in arg[1:]:
-                            flag = f"-{char}"
-                            if flag in flags:
-                                explanation.append(f"    {flag}: {flags[flag]}")
-                elif arg in flags:
-                    explanation.append(f"    {arg}: {flags[arg]}")
-                elif arg in subcommands:
-                    explanation.append(f"    {arg}: {subcommands[arg]}")
+            _explain_sudo_flags(sub_args, details.get("flags", {}),
+                                details.get("subcommands", {}), explanation)
         
         # Handle special sub-commands that need custom parsing
         if sub_command == "find" and sub_args:
-            explanation.append(f"  search_path: {sub_args[0]}")
-            
             # Get find flags from man page for dynamic parsing
-            details = get_command_details("find")
-            find_flags = details.get("flags", {})
-            
-            i = 1
-            while i < len(sub_args):
-                arg = sub_args[i]
-                
-                # Handle flags that take values
-                if arg in find_flags and i + 1 < len(sub_args):
-                    next_arg = sub_args[i+1]
-                    # Check if next argument is a value (not another flag)
-                    is_value = (
-                        not next_arg.startswith('-') or  # Not a flag
-                        next_arg[1:].isdigit() or        # Negative number like -7
-                        next_arg.startswith('+') or      # Positive number like +30
-                        next_arg in ['{}', ';'] or       # Special find tokens
-                        (len(next_arg) > 1 and next_arg[1] in '0123456789')  # Negative number
-                    )
-                    
-                    if is_value:
-                        value = next_arg
-                        if arg == "-name":
-                            explanation.append(f"    -name: find files matching pattern '{value}'")
-                        elif arg == "-type":
-                            type_desc = {"f": "regular file", "d": "directory", "l": "symbolic link"}.get(value, value)
-                            explanation.append(f"    -type: find items of type '{type_desc}'")
-                        elif arg == "-mtime":
-                            if value.startswith('+'):
-                                explanation.append(f"    -mtime: find files modified more than {value[1:]} days ago")
-                            elif value.startswith('-'):
-                                explanation.append(f"    -mtime: find files modified less than {value[1:]} days ago")
-                            else:
-                                explanation.append(f"    -mtime: find files modified exactly {value} days ago")
-                        elif arg == "-mmin":
-                            if value.startswith('+'):
-                                explanation.append(f"    -mmin: find files modified more than {value[1:]} minutes ago")
-                            elif value.startswith('-'):
-                                explanation.append(f"    -mmin: find files modified less than {value[1:]} minutes ago")
-                            else:
-                                explanation.append(f"    -mmin: find files modified exactly {value} minutes ago")
-                        elif arg == "-size":
-                            explanation.append(f"    -size: find files of size {value}")
-                        elif arg == "-user":
-                            explanation.append(f"    -user: find files owned by user '{value}'")
-                        elif arg == "-group":
-                            explanation.append(f"    -group: find files owned by group '{value}'")
-                        elif arg == "-perm":
-                            explanation.append(f"    -perm: find files with permissions {value}")
-                        elif arg == "-exec":
-                            explanation.append(f"    -exec: execute command '{value}' on found files")
-                        else:
-                            explanation.append(f"    {arg}: {find_flags[arg]} (value: {value})")
-                        i += 2
-                    else:
-                        # Not a value, treat as flag without value
-                        if arg == "-delete":
-                            explanation.append(f"    -delete: delete found files (dangerous)")
-                            warnings.append("The -delete flag will permanently remove files")
-                        elif arg == "-print":
-                            explanation.append(f"    -print: print found files (default action)")
-                        elif arg == "-ls":
-                            explanation.append(f"    -ls: list found files in long format")
-                        elif arg == "-executable":
-                            explanation.append(f"    -executable: find executable files")
-                        elif arg == "-readable":
-                            explanation.append(f"    -readable: find readable files")
-                        elif arg == "-writable":
-                            explanation.append(f"    -writable: find writable files")
-                        else:
-                            explanation.append(f"    {arg}: {find_flags[arg]}")
-                        i += 1
-                elif arg in find_flags:
-                    # Flag without value
-                    if arg == "-delete":
-                        explanation.append(f"    -delete: delete found files (dangerous)")
-                        warnings.append("The -delete flag will permanently remove files")
-                    elif arg == "-print":
-                        explanation.append(f"    -print: print found files (default action)")
-                    elif arg == "-ls":
-                        explanation.append(f"    -ls: list found files in long format")
-                    elif arg == "-executable":
-                        explanation.append(f"    -executable: find executable files")
-                    elif arg == "-readable":
-                        explanation.append(f"    -readable: find readable files")
-                    elif arg == "-writable":
-                        explanation.append(f"    -writable: find writable files")
-                    else:
-                        explanation.append(f"    {arg}: {find_flags[arg]}")
-                    i += 1
-                elif arg == "{}":
-                    # This is part of -exec, skip it
-                    i += 1
-                elif arg == ";":
-                    # End of -exec command
-                    i += 1
-                else:
-                    explanation.append(f"    argument: {arg}")
-                    i += 1
+            find_flags = get_command_details("find").get("flags", {})
+            _explain_find(sub_args, find_flags, "    ", explanation, warnings)
         else:
             # Add remaining arguments for other commands
-            remaining_args = [arg for arg in sub_args if not arg.startswith("-")]
+            remaining_args = [arg for arg in sub_args if arg[:1] != '-']
             if remaining_args:
                 explanation.append(f"  Arguments: {', '.join(remaining_args)}")
         
         return explanation, warnings
 
-    if command in knowledge_base:
-        command_info = knowledge_base[command]
+    # Fetched once: supplies dynamic flags, subcommands and find's flags below
+    details = get_command_details(command)
+    command_info = kb_get(command)
+    if command_info is not None:
         explanation.append(f"{command}: {command_info['description']}")
-        if command_info['danger_level'] in ["high", "critical"]:
+        if command_info['danger_level'] in HIGH_RISK_LEVELS:
             warnings.append(f"The command '{command}' is considered {command_info['danger_level']} risk.")
 
-        flags = command_info.get("flags", {})
-        # Always try to get additional flags dynamically and merge them
-        details = get_command_details(command)
-        dynamic_flags = details.get("flags", {})
-        # Merge dynamic flags with hardcoded ones (dynamic takes precedence for conflicts)
-        flags.update(dynamic_flags)
-        used_flags = []
-        i = 0
-        while i < len(args):
-            arg = args[i]
-            if arg.startswith("--"):
-                name, eq, val = arg.partition('=')
-                if name in flags:
-                    truncated_desc = truncate_description(flags[name])
-                    if eq and val:
-                        explanation.append(f"  {name}: {truncated_desc} (value: {val})")
-                    elif i + 1 < len(args) and not args[i+1].startswith('-'):
-                        explanation.append(f"  {name}: {truncated_desc} (value: {args[i+1]})")
-                        i += 1
-                    else:
-                        explanation.append(f"  {name}: {truncated_desc}")
-            elif arg.startswith("-") and len(arg) > 2:
-                # Use the new combined flag parser
-                flag_results = parse_combined_flags(arg, flags)
-                for flag, desc in flag_results:
-                    truncated_desc = truncate_description(desc)
-                    explanation.append(f"  {flag}: {truncated_desc}")
-            elif arg in flags:
-                # Short flag possibly with a following value
-                if i + 1 < len(args) and not args[i+1].startswith('-'):
-                    truncated_desc = truncate_description(flags[arg])
-                    explanation.append(f"  {arg}: {truncated_desc} (value: {args[i+1]})")
-                    i += 1
-                else:
-                    truncated_desc = truncate_description(flags[arg])
-                    explanation.append(f"  {arg}: {truncated_desc}")
-            i += 1
+        # Always merge in the additional flags found dynamically
+        flags = _merged_flags(command, command_info, details)
+        lines, consumed = _parse_flags(command, args, flags)
     else:
-        details = get_command_details(command)
         if details.get("summary"):
             explanation.append(details["summary"])
         flags = details.get("flags", {})
         subcommands = details.get("subcommands", {})
-        
-        i = 0
-        while i < len(args):
-            arg = args[i]
-            if arg.startswith("--"):
-                name, eq, val = arg.partition('=')
-                if name in flags:
-                    truncated_desc = truncate_description(flags[name])
-                    if eq and val:
-                        explanation.append(f"  {name}: {truncated_desc} (value: {val})")
-                    elif i + 1 < len(args) and not args[i+1].startswith('-'):
-                        explanation.append(f"  {name}: {truncated_desc} (value: {args[i+1]})")
-                        i += 1
-                    else:
-                        explanation.append(f"  {name}: {truncated_desc}")
-            elif arg.startswith("-") and len(arg) > 2:
-                # Use the new combined flag parser
-                flag_results = parse_combined_flags(arg, flags)
-                for flag, desc in flag_results:
-                    truncated_desc = truncate_description(desc)
-                    explanation.append(f"  {flag}: {truncated_desc}")
-            elif arg in flags:
-                if i + 1 < len(args) and not args[i+1].startswith('-'):
-                    explanation.append(f"  {arg}: {flags[arg]} (value: {args[i+1]})")
-                    i += 1
-                else:
-                    explanation.append(f"  {arg}: {flags[arg]}")
-            elif arg in subcommands:
-                # Handle subcommands
-                explanation.append(f"  {arg}: {subcommands[arg]}")
-            i += 1
+        lines, consumed = _parse_flags(command, args, flags, subcommands)
+    explanation.extend(lines)
 
-    # Detect I/O redirections in args and mark consumed indices
-    redirections = []  # list of tuples (op, target)
-    i = 0
-    while i < len(args):
-        tok = args[i]
-        # Supported forms: '>', '>>', '1>', '2>', '1>>', '2>>'
-        if tok in ('>', '>>') or (len(tok) <= 3 and tok.endswith(('>', '>>')) and tok[:-1].isdigit()):
-            if i + 1 < len(args):
-                redirections.append((tok, args[i+1]))
-                i += 1
-        i += 1
+    # Filter out recognized subcommands from positional args
+    recognized_subcommands = details.get("subcommands", {})
 
-    # Remove values already consumed by flags
-    consumed = set()
-    i = 0
-    while i < len(args):
-        arg = args[i]
-        # Generic signal flag explanations for kill-like commands
-        if command in ("kill", "killall"):
-            next_arg = args[i+1] if i + 1 < len(args) else None
-            sig_exp = explain_signal_flag(arg, next_arg)
-            if sig_exp:
-                explanation.append(sig_exp)
-                if arg == '-s' and next_arg and not next_arg.startswith('-'):
-                    consumed.add(i+1)
-        # Skip flag parsing for find command - handle it specially later
-        elif command != "find" and arg.startswith('--'):
-            name, eq, val = arg.partition('=')
-            if eq and val:
-                pass
-            elif i + 1 < len(args) and not args[i+1].startswith('-'):
-                consumed.add(i+1)
-                i += 1
-        # Do not generically consume a value after single-dash short flags;
-        # Without per-command metadata this can misclassify positional args
-        i += 1
-    # Exclude redirection targets as positional args
-    redir_target_indices = set()
+    # Fast path for the common shape: a plain command with no redirections
+    # only needs the generic Arguments line
+    if command not in POSITIONAL_COMMANDS and REDIRECTION_OPERATORS.isdisjoint(args):
+        positional_args = [tok for i, tok in enumerate(args)
+                           if i not in consumed and tok[:1] != '-' and tok not in recognized_subcommands]
+        if positional_args:
+            explanation.append(f"Arguments: {', '.join(positional_args)}")
+        return explanation, warnings
+    # find's expression is explained from args directly; skip the filter
+    collect_positional = command != "find"
+
+    # One pass collects I/O redirections and positional args; redirection
+    # targets are not positional args
+    redirections = []  # list of tuples (op, target)
+    positional_args = []
     i = 0
     while i < len(args):
         tok = args[i]
-        if tok in ('>', '>>') or (len(tok) <= 3 and tok.endswith(('>', '>>')) and tok[:-1].isdigit()):
-            if i + 1 < len(args):
-                redir_target_indices.add(i+1)
-                i += 1
+        if collect_positional and i not in consumed and tok[:1] != '-' and tok not in recognized_subcommands:
+            positional_args.append(tok)
+        # Supported forms: '>', '>>', 'N>', 'N>>' for a one- or two-digit fd N
+        if tok in REDIRECTION_OPERATORS and i + 1 < len(args):
+            redirections.append((tok, args[i+1]))
+            i += 1
         i += 1
-
-    # Filter out recognized subcommands from positional args
-    recognized_subcommands = set()
-    if command in knowledge_base:
-        # For commands in knowledge base, check if they have subcommands
-        details = get_command_details(command)
-        recognized_subcommands = set(details.get("subcommands", {}).keys())
-    else:
-        # For commands not in knowledge base, get subcommands from man parser
-        details = get_command_details(command)
-        recognized_subcommands = set(details.get("subcommands", {}).keys())
-    
-    positional_args = [arg for idx, arg in enumerate(args) if idx not in consumed and idx not in redir_target_indices and not arg.startswith("-") and arg not in recognized_subcommands]
     
     # Special handling for find command (before other command-specific logic)
     if command == "find" and args:
-        explanation.append(f"  search_path: {args[0]}")
-        
-        # Get find flags from man page for dynamic parsing
-        details = get_command_details("find")
-        find_flags = details.get("flags", {})
-        
-        i = 1
-        while i < len(args):
-            arg = args[i]
-            
-            # Handle flags that take values
-            if arg in find_flags and i + 1 < len(args):
-                next_arg = args[i+1]
-                # Check if next argument is a value (not another flag)
-                # Values can be: numbers, negative numbers, patterns, etc.
-                is_value = (
-                    not next_arg.startswith('-') or  # Not a flag
-                    next_arg[1:].isdigit() or        # Negative number like -7
-                    next_arg.startswith('+') or      # Positive number like +30
-                    next_arg in ['{}', ';'] or       # Special find tokens
-                    (len(next_arg) > 1 and next_arg[1] in '0123456789')  # Negative number
-                )
-                
-                if is_value:
-                    value = next_arg
-                    if arg == "-name":
-                        explanation.append(f"  -name: find files matching pattern '{value}'")
-                    elif arg == "-type":
-                        type_desc = {"f": "regular file", "d": "directory", "l": "symbolic link"}.get(value, value)
-                        explanation.append(f"  -type: find items of type '{type_desc}'")
-                    elif arg == "-mtime":
-                        if value.startswith('+'):
-                            explanation.append(f"  -mtime: find files modified more than {value[1:]} days ago")
-                        elif value.startswith('-'):
-                            explanation.append(f"  -mtime: find files modified less than {value[1:]} days ago")
-                        else:
-                            explanation.append(f"  -mtime: find files modified exactly {value} days ago")
-                    elif arg == "-mmin":
-                        if value.startswith('+'):
-                            explanation.append(f"  -mmin: find files modified more than {value[1:]} minutes ago")
-                        elif value.startswith('-'):
-                            explanation.append(f"  -mmin: find files modified less than {value[1:]} minutes ago")
-                        else:
-                            explanation.append(f"  -mmin: find files modified exactly {value} minutes ago")
-                    elif arg == "-size":
-                        explanation.append(f"  -size: find files of size {value}")
-                    elif arg == "-user":
-                        explanation.append(f"  -user: find files owned by user '{value}'")
-                    elif arg == "-group":
-                        explanation.append(f"  -group: find files owned by group '{value}'")
-                    elif arg == "-perm":
-                        explanation.append(f"  -perm: find files with permissions {value}")
-                    elif arg == "-exec":
-                        explanation.append(f"  -exec: execute command '{value}' on found files")
-                    else:
-                        explanation.append(f"  {arg}: {find_flags[arg]} (value: {value})")
-                    i += 2
-                else:
-                    # Not a value, treat as flag without value
-                    if arg == "-delete":
-                        explanation.append(f"  -delete: delete found files (dangerous)")
-                        warnings.append("The -delete flag will permanently remove files")
-                    elif arg == "-print":
-                        explanation.append(f"  -print: print found files (default action)")
-                    elif arg == "-ls":
-                        explanation.append(f"  -ls: list found files in long format")
-                    elif arg == "-executable":
-                        explanation.append(f"  -executable: find executable files")
-                    elif arg == "-readable":
-                        explanation.append(f"  -readable: find readable files")
-                    elif arg == "-writable":
-                        explanation.append(f"  -writable: find writable files")
-                    else:
-                        explanation.append(f"  {arg}: {find_flags[arg]}")
-                    i += 1
-            elif arg in find_flags:
-                # Flag without value
-                if arg == "-delete":
-                    explanation.append(f"  -delete: delete found files (dangerous)")
-                    warnings.append("The -delete flag will permanently remove files")
-                elif arg == "-print":
-                    explanation.append(f"  -print: print found files (default action)")
-                elif arg == "-ls":
-                    explanation.append(f"  -ls: list found files in long format")
-                elif arg == "-executable":
-                    explanation.append(f"  -executable: find executable files")
-                elif arg == "-readable":
-                    explanation.append(f"  -readable: find readable files")
-                elif arg == "-writable":
-                    explanation.append(f"  -writable: find writable files")
-                else:
-                    explanation.append(f"  {arg}: {find_flags[arg]}")
-                i += 1
-            
-            # Handle special cases
-            elif arg == "{}":
-                # This is part of -exec, skip it
-                i += 1
-            elif arg == ";":
-                # End of -exec command
-                i += 1
-            else:
-                explanation.append(f"  argument: {arg}")
-                i += 1
+        # Find flags from the man page details already fetched for this command
+        _explain_find(args, details.get("flags", {}), "  ", explanation, warnings)
     elif command == "grep" and positional_args:
-        explanation.append(f"  pattern: {positional_args[0]}")
-        if looks_like_regex(positional_args[0]):
-            explanation.append(f"  regex: {explain_regex(positional_args[0])}")
+        pattern = positional_args[0]
+        explanation.append(f"  pattern: {pattern}")
+        # Plain literal patterns (the common case) skip the regex explainer entirely
+        if not REGEX_METACHARACTERS.isdisjoint(pattern):
+            from src.regex_explainer import looks_like_regex, explain_regex
+            if looks_like_regex(pattern):
+                explanation.append(f"  regex: {explain_regex(pattern)}")
         if len(positional_args) > 1:
             explanation.append(f"  files: {', '.join(positional_args[1:])}")
     elif command == "chmod" and positional_args:
         mode = positional_args[0]
         target = ", ".join(positional_args[1:]) if len(positional_args) > 1 else None
         # Octal mode like 755 or 0644
-        import re as _re
-        if _re.fullmatch(r"0?[0-7]{3}", mode):
+        if OCTAL_MODE_RE.fullmatch(mode):
             digits = mode[-3:]
             who = ["owner", "group", "others"]
             bits = []
@@ -863,55 +817,107 @@ def _analyze_single_command(tokens, knowledge_base):
 
     # Add explanations for redirections and warnings for overwrite
     for op, target in redirections:
-        if op in ('>', '1>'):
-            explanation.append(f"- {op} {target}: redirects the output into a file named {target} (overwrites file if it exists)")
+        describe = REDIRECTION_DESCRIPTIONS.get(op)
+        if describe is not None:
+            explanation.append(f"- {op} {target}: {describe(target)}")
+        if op in OVERWRITING_REDIRECTIONS:
             warnings.append(f"This command overwrites {target}. Any existing content will be lost.")
-        elif op in ('>>', '1>>'):
-            explanation.append(f"- {op} {target}: appends standard output to {target}")
-        elif op.startswith('2') and op.endswith('>>'):
-            explanation.append(f"- {op} {target}: appends standard error to {target}")
-        elif op.startswith('2') and op.endswith('>'):
-            explanation.append(f"- {op} {target}: redirects standard error to {target} (overwrites)")
 
     return explanation, warnings
 
 
-def analyze_command(tokens, knowledge_base):
-    segments = []
-    current = []
+def _command_names(tokens):
+    """Return the distinct commands of a tokenized line whose details get looked up."""
+    names = []
+    expect_command = True
+    sudo = False
     for tok in tokens:
-        if tok in ['|', '&&', '||', ';']:
-            if current:
-                segments.append(current)
-                current = []
-            # Add the operator as a separate segment for explanation
-            segments.append([tok])
-        else:
-            current.append(tok)
-    if current:
-        segments.append(current)
+        if tok in CONTROL_OPERATORS:
+            expect_command = True
+        elif expect_command or sudo:
+            if tok == "sudo" and not sudo:
+                # sudo's own details are never used; the command it runs is
+                sudo = True
+            else:
+                names.append(tok)
+                sudo = False
+            expect_command = False
+    return list(dict.fromkeys(names))
+
+# Background lookups share one small pool across the process, so long
+# pipelines and concurrent API requests cannot fork unbounded subprocesses
+PREFETCH_WORKERS = 4
+_prefetch_pool = None
+# threading.Lock is _thread's lock; the builtin module is always loaded, so
+# this does not pull threading into CLI startup
+_prefetch_pool_lock = _thread.allocate_lock()
+
+def _prefetch_executor():
+    """Return the process-wide prefetch pool, creating it on first use."""
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        with _prefetch_pool_lock:
+            if _prefetch_pool is None:
+                _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                                    thread_name_prefix="explain-prefetch")
+    return _prefetch_pool
+
+def _prefetch_details(commands):
+    """Look up several commands' details concurrently so later calls hit the cache.
+
+    Each uncached lookup runs --help and man in subprocesses, so a pipeline
+    of new commands waits for the slowest few lookups instead of for all of
+    them. At most PREFETCH_WORKERS lookups run in the background at once.
+    """
+    if len(commands) < 2:
+        return
+    from concurrent.futures import wait
+    from src.man_parser import get_command_details
+
+    def fetch(command):
+        try:
+            get_command_details(command)
+        except Exception:
+            pass  # Raised again, in order, when the command is analyzed
+
+    executor = _prefetch_executor()
+    futures = [executor.submit(fetch, command) for command in commands[1:]]
+    fetch(commands[0])
+    wait(futures)
+
+def analyze_command(tokens, knowledge_base, out=None):
+    """Explain a tokenized command line, returning (explanation, warnings).
 
-    all_explanations = []
+    Explanation lines are appended to `out` as they are produced; pass an
+    ExplanationPrinter to stream them instead of collecting a list.
+    """
+    all_explanations = [] if out is None else out
     all_warnings = []
-    for segment in segments:
-        if len(segment) == 1 and segment[0] in ['&&', '||', ';', '|']:
+    _prefetch_details(_command_names(tokens))
+    # One pass: each command is sliced out and explained as soon as its
+    # operator (or the end of the line) is reached
+    start = 0
+    for i, tok in enumerate(tokens):
+        if tok in CONTROL_OPERATORS:
+            if i > start:
+                _, warns = _analyze_single_command(tokens[start:i], knowledge_base, all_explanations)
+                all_warnings.extend(warns)
             # Explain operators
-            op = segment[0]
-            if op == '&&':
-                all_explanations.append(f"  {op}: Execute next command only if previous command succeeds")
-            elif op == '||':
-                all_explanations.append(f"  {op}: Execute next command only if previous command fails")
-            elif op == ';':
-                all_explanations.append(f"  {op}: Execute next command regardless of previous command's result")
-            elif op == '|':
-                all_explanations.append(f"  {print_pipe_operator(op)}: Pipe the output of the previous command as input to the next command")
-        else:
-            exp, warns = _analyze_single_command(segment, knowledge_base)
-            all_explanations.extend(exp)
-            all_warnings.extend(warns)
+            if tok == '|':
+                all_explanations.append(f"  {print_pipe_operator(tok)}: {OPERATOR_DESCRIPTIONS[tok]}")
+            else:
+                all_explanations.append(f"  {tok}: {OPERATOR_DESCRIPTIONS[tok]}")
+            start = i + 1
+    if start < len(tokens):
+        _, warns = _analyze_single_command(tokens[start:], knowledge_base, all_explanations)
+        all_warnings.extend(warns)
     return all_explanations, all_warnings
 
-def main():
+def build_arg_parser():
+    """Build the full argparse parser, used for --help and argument errors."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Explain shell commands with detailed flag descriptions and security warnings.",
         epilog="Examples:\n"
@@ -937,35 +943,85 @@ def main():
     parser.add_argument("--port", type=int, default=8080, 
                        help="API server port (default: 8080)")
 
-    args = parser.parse_args()
+    return parser
+
+# FLAGS values for --add-command meaning "no flags"
+NO_FLAGS_VALUES = frozenset(("none", "null", "nil", "-"))
+
+# One "flag:description" item of an --add-command FLAGS string
+_FLAG_SPEC_RE = re.compile(r"([^,:]*):([^,]*)")
+
+def parse_flag_spec(flags_str):
+    """Parse flags given as "-f:desc, -g:desc"; "none" (or empty) means no flags."""
+    if not flags_str or flags_str.strip().lower() in NO_FLAGS_VALUES:
+        return {}
+    return {
+        flag.strip().replace("'", ""): desc.strip().replace("'", "")
+        for flag, desc in _FLAG_SPEC_RE.findall(flags_str)
+    }
+
+# Options that take no value, mapped to their attribute names
+_BOOLEAN_OPTIONS = {
+    "--no-color": "no_color",
+    "--no-auto-escape": "no_auto_escape",
+    "--api": "api",
+}
+
+def parse_args(argv):
+    """Parse command line arguments.
+
+    Common invocations are parsed directly, since importing and building the
+    argparse parser costs more than explaining a command. Anything else
+    (--help, abbreviated or unknown options, bad values) is handed to argparse
+    so help output and error messages stay the same.
+    """
+    args = SimpleNamespace(command_string=None, add_command=None, no_color=False,
+                           no_auto_escape=False, api=False, host="localhost", port=8080)
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in _BOOLEAN_OPTIONS:
+            setattr(args, _BOOLEAN_OPTIONS[arg], True)
+        elif arg == "--add-command" and i + 4 < len(argv):
+            args.add_command = argv[i+1:i+5]
+            i += 4
+        elif arg == "--host" and i + 1 < len(argv):
+            args.host = argv[i+1]
+            i += 1
+        elif arg == "--port" and i + 1 < len(argv):
+            try:
+                args.port = int(argv[i+1])
+            except ValueError:
+                return build_arg_parser().parse_args(argv)
+            i += 1
+        elif not arg.startswith("-") and args.command_string is None:
+            args.command_string = arg
+        else:
+            return build_arg_parser().parse_args(argv)
+        i += 1
+    return args
+
+def main():
+    args = parse_args(sys.argv[1:])
 
     # Set the no-color flag
     set_no_color(args.no_color)
 
-    custom_commands = load_custom_commands()
-    knowledge_base = {**COMMAND_KNOWLEDGE_BASE, **custom_commands}
-
     # Handle API mode
     if args.api:
-        start_api_server(args.host, args.port, knowledge_base)
+        start_api_server(args.host, args.port)
         return
 
     if args.add_command:
         command, description, danger_level, flags_str = args.add_command
-        # Parse flags provided as "-f:desc, -g:desc"; allow "none" to mean no flags
-        flags = {}
-        if flags_str and flags_str.strip().lower() not in {"none", "null", "nil", "-"}:
-            parts = [p.strip() for p in flags_str.split(",") if p.strip()]
-            for part in parts:
-                if ":" in part:
-                    k, v = part.split(":", 1)
-                    flags[k.strip().replace("'", "")] = v.strip().replace("'", "")
+        flags = parse_flag_spec(flags_str)
+        from src.custom_commands import add_custom_command
         add_custom_command(command, description, danger_level, flags)
         print(f"{colorize_with_flag('Success:', Colors.SUCCESS)} Command '{colorize_with_flag(command, Colors.COMMAND)}' added to the custom knowledge base.")
         return
 
     if not args.command_string:
-        parser.print_help()
+        build_arg_parser().print_help()
         return
 
     # Validate input length to prevent DoS attacks
@@ -983,16 +1039,21 @@ def main():
         if escaped_command != args.command_string:
             print(f"{colorize_with_flag('Note:', Colors.META)} Auto-escaped command: {colorize_with_flag(escaped_command, Colors.DESCRIPTION)}")
     
+    # Deferred so --help, --api and --add-command skip the analysis modules
+    from src.parser import tokenize_command
+    from src.danger_detector import detect_dangerous_patterns
+
     tokens = tokenize_command(escaped_command)
     
-    explanation, analysis_warnings = analyze_command(tokens, knowledge_base)
+    # Only the explain path needs the knowledge base
+    knowledge_base = get_knowledge_base()
+
+    # Print colorized output, streaming explanation lines as they are produced
+    print_header(args.command_string)
+    _, analysis_warnings = analyze_command(tokens, knowledge_base, ExplanationPrinter())
     danger_warnings = detect_dangerous_patterns(args.command_string, tokens)
 
     all_warnings = analysis_warnings + danger_warnings
-
-    # Print colorized output
-    print_header(args.command_string)
-    print_explanation(explanation, all_warnings)
     print_warnings(all_warnings)
 
 if __name__ == "__main__":
@@ -21,6 +21,9 @@ mkdir -p "$APP_DIR"
 cp -f "$SOURCE_DIR/cli.py" "$APP_DIR/cli.py"
 cp -a "$SOURCE_DIR/src" "$APP_DIR/"
 
+# Precompile bytecode now; users cannot write __pycache__ under the root-owned app dir
+python3 -m compileall -q "$APP_DIR" > /dev/null
+
 # Create/overwrite wrapper script in /usr/local/bin
 cat > "$INSTALL_DIR/$SCRIPT_NAME" << 'EOF'
 #!/bin/bash
@@ -0,0 +1,208 @@
+import json
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder is used without it
+    orjson = None
+
+# API documentation served at GET /
+API_INFO = {
+    "name": "explain-cli API",
+    "version": "1.0.0",
+    "description": "RESTful API for shell command explanation and analysis",
+    "endpoints": {
+        "POST /explain": {
+            "description": "Analyze and explain shell commands with flag descriptions and security warnings",
+            "parameters": {
+                "command": "Shell command to explain (required, string)",
+                "no_auto_escape": "Disable automatic character escaping (optional, boolean, default: false)",
+                "no_color": "Disable colored output formatting (optional, boolean, default: true)"
+            },
+            "headers": {
+                "Accept": "Send application/json+pretty for indented JSON (optional, default: compact)"
+            },
+            "response": {
+                "command": "Original command string",
+                "escaped_command": "Auto-escaped version (if applicable)",
+                "explanation": "Array of explanation lines",
+                "warnings": "Array of security warnings",
+                "success": "Boolean indicating success"
+            }
+        },
+        "GET /": "API documentation and usage information"
+    },
+    "usage_examples": {
+        "curl": "curl -X POST http://localhost:8080/explain -H 'Content-Type: application/json' -d '{\"command\": \"ls -la\"}'",
+        "python": "import requests; response = requests.post('http://localhost:8080/explain', json={'command': 'ls -la'}); print(response.json())",
+        "javascript": "fetch('http://localhost:8080/explain', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({command: 'ls -la'})}).then(r => r.json()).then(console.log)"
+    },
+    "error_codes": {
+        "400": "Bad Request - Invalid JSON or missing required fields",
+        "413": "Payload Too Large - Request body exceeds the size limit",
+        "404": "Not Found - Invalid endpoint",
+        "500": "Internal Server Error - Processing error"
+    }
+}
+
+# Longest command accepted by POST /explain, in characters
+MAX_COMMAND_LENGTH = 10000
+# Largest request body read: room for a maximal command in which every
+# character is a JSON surrogate-pair escape, plus the other fields
+MAX_BODY_BYTES = 12 * MAX_COMMAND_LENGTH + 1024
+
+# Accept header value that opts into indented /explain responses
+PRETTY_JSON_TYPE = 'application/json+pretty'
+
+def encode_json(obj, pretty=False):
+    """Encode a response body, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except orjson.JSONEncodeError:
+            pass  # e.g. lone surrogates, which json escapes
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+# Encoded once; the documentation never changes while the server runs
+API_INFO_BYTES = encode_json(API_INFO, pretty=True)
+
+
+class ExplainAPIHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for the explain-cli API server."""
+    
+    # Keep connections open between requests; every response sends a
+    # Content-Length, and send_error closes the connection
+    protocol_version = 'HTTP/1.1'
+    
+    def __init__(self, knowledge_base, explain, *args, **kwargs):
+        self.knowledge_base = knowledge_base
+        self.explain = explain
+        super().__init__(*args, **kwargs)
+    
+    def _discard_body(self):
+        """Drop a request body nothing reads, so it isn't parsed as the next request."""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if 0 < length <= MAX_BODY_BYTES:
+            self.rfile.read(length)
+        elif length:
+            self.close_connection = True
+    
+    def do_GET(self):
+        """Handle GET requests - return API documentation."""
+        self._discard_body()
+        if self.path == '/':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(API_INFO_BYTES)))
+            self.end_headers()
+            self.wfile.write(API_INFO_BYTES)
+        else:
+            self.send_error(404, "Not Found")
+    
+    def do_POST(self):
+        """Handle POST requests - explain commands."""
+        if self.path == '/explain':
+            try:
+                # Check the declared size before reading anything
+                try:
+                    content_length = int(self.headers.get('Content-Length', 0))
+                except ValueError:
+                    self.send_error(400, "Invalid Content-Length")
+                    return
+                if content_length < 0:
+                    # rfile.read(-1) would block until the client hangs up
+                    self.send_error(400, "Invalid Content-Length")
+                    return
+                if content_length > MAX_BODY_BYTES:
+                    self.send_error(413, "Payload too large")
+                    return
+                post_data = self.rfile.read(content_length)
+                
+                # Parse JSON; json.loads decodes the UTF-8 bytes itself
+                try:
+                    data = json.loads(post_data)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    self.send_error(400, "Invalid JSON")
+                    return
+                
+                # Validate required fields
+                if 'command' not in data:
+                    self.send_error(400, "Missing required field: command")
+                    return
+                
+                command = data['command']
+                no_auto_escape = data.get('no_auto_escape', False)
+                no_color = data.get('no_color', True)  # Default to no color for API
+                
+                # Validate input length
+                if len(command) > MAX_COMMAND_LENGTH:
+                    self.send_error(400, f"Command string too long (max {MAX_COMMAND_LENGTH} characters)")
+                    return
+                
+                # Process the command
+                result = self.explain(command, no_auto_escape, no_color, self.knowledge_base)
+                
+                # Compact by default; indenting is slower and about triples the size
+                body = encode_json(result, pretty=self.headers.get('Accept') == PRETTY_JSON_TYPE)
+                
+                # Send response
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+                self.end_headers()
+                
+                self.wfile.write(body)
+                
+            except Exception as e:
+                self.send_error(500, f"Internal server error: {str(e)}")
+        else:
+            self.send_error(404, "Not Found")
+    
+    def do_OPTIONS(self):
+        """Handle CORS preflight requests."""
+        self._discard_body()
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        """Override to reduce log verbosity."""
+        pass
+
+def create_api_handler(knowledge_base, explain):
+    """Create an API handler with the knowledge base and explain function."""
+    def handler(*args, **kwargs):
+        return ExplainAPIHandler(knowledge_base, explain, *args, **kwargs)
+    return handler
+
+def start_api_server(host, port, knowledge_base, explain):
+    """Start the API server.
+
+    `explain` is called as explain(command, no_auto_escape, no_color, knowledge_base)
+    and must return the JSON-serializable result for POST /explain.
+    """
+    handler_class = create_api_handler(knowledge_base, explain)
+    # One thread per request, so a slow man/--help lookup doesn't block other clients
+    server = ThreadingHTTPServer((host, port), handler_class)
+    
+    print(f"explain-cli API server starting on http://{host}:{port}")
+    print(f"API documentation available at http://{host}:{port}")
+    print(f"Example usage: curl -X POST http://{host}:{port}/explain -H 'Content-Type: application/json' -d '{{\"command\": \"ls -la\"}}'")
+    print("Press Ctrl+C to stop the server")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down API server...")
+        server.shutdown()
@@ -5,17 +5,34 @@ import os
 _MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 KNOWLEDGE_BASE_PATH = os.path.join(_MODULE_DIR, "custom_knowledge_base.json")
 
+# (mtime_ns, commands) from the last read or write of KNOWLEDGE_BASE_PATH
+_cache = None
+
 def load_custom_commands():
-    """Loads the custom knowledge base from the JSON file."""
+    """Loads the custom knowledge base from the JSON file.
+
+    The parsed file is reused until its mtime changes, so treat the result as
+    read-only.
+    """
+    global _cache
+    try:
+        mtime = os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _cache is not None and _cache[0] == mtime:
+        return _cache[1]
     try:
         with open(KNOWLEDGE_BASE_PATH, "r") as f:
-            return json.load(f)
+            commands = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
+    _cache = (mtime, commands)
+    return commands
 
 def add_custom_command(command, description, danger_level, flags):
     """Adds a new command to the custom knowledge base."""
-    custom_commands = load_custom_commands()
+    global _cache
+    custom_commands = dict(load_custom_commands())
     custom_commands[command] = {
         "description": description,
         "danger_level": danger_level,
@@ -23,3 +40,5 @@ def add_custom_command(command, description, danger_level, flags):
     }
     with open(KNOWLEDGE_BASE_PATH, "w") as f:
         json.dump(custom_commands, f, indent=4)
+    # What was just written is the file's content; no need to read it back
+    _cache = (os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns, custom_commands)
@@ -1,44 +1,80 @@
+import re
+from functools import lru_cache
+
+DOWNLOADERS = frozenset(("curl", "wget"))
+INTERPRETERS = frozenset(("bash", "sh", "python", "python3", "perl", "ruby", "node", "php"))
+SCRIPT_EXTENSIONS = (".py", ".sh", ".bash", ".pl", ".rb", ".js", ".php")
+SUSPICIOUS_URL_WORDS = ("attacker", "malware", "evil")
+# Each list as one alternation, so a URL is scanned once per list rather than once per entry
+_SCRIPT_EXTENSION_RE = re.compile("|".join(map(re.escape, SCRIPT_EXTENSIONS)))
+_SUSPICIOUS_URL_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_URL_WORDS)))
+# Tokens that each must appear for the `rm -rf /` warning
+RM_RF_ROOT = frozenset(("rm", "-rf", "/"))
+
+# Sensitive file reads
+SENSITIVE_PATHS = {
+    "/etc/shadow": "Contains password hashes for system users (highly sensitive)",
+    "/etc/passwd": "Contains user account information (less sensitive but still private)",
+    "~/.ssh/id_rsa": "Private SSH key (highly sensitive)",
+    "~/.ssh/id_ed25519": "Private SSH key (highly sensitive)",
+    "/root/.ssh/id_rsa": "Root's private SSH key (highly sensitive)",
+}
+READ_COMMANDS = frozenset(("cat", "less", "more", "head", "tail", "sed", "awk", "grep", "cut"))
+
+# Every token-based rule needs at least one of these tokens to fire
+TRIGGER_TOKENS = frozenset(("rm", ">")) | DOWNLOADERS | READ_COMMANDS
+FORK_BOMB = ":(){ :|:& };:"
+
+
 def detect_dangerous_patterns(command_string, tokens):
+    """Return warnings for dangerous patterns in a command.
+
+    Results are cached per (command_string, tokens), so repeated explains of
+    the same command (e.g. through the API) skip the scan.
+    """
+    return list(_detect_dangerous_patterns(command_string, tuple(tokens)))
+
+
+@lru_cache(maxsize=512)
+def _detect_dangerous_patterns(command_string, tokens):
     warnings = []
-    if "rm" in tokens and "-rf" in tokens and "/" in tokens:
+    # Built once; every membership test below is a set probe instead of a list scan
+    token_set = frozenset(tokens)
+    # Typical commands trigger nothing; skip every rule at once
+    if token_set.isdisjoint(TRIGGER_TOKENS) and FORK_BOMB not in command_string:
+        return ()
+    if RM_RF_ROOT <= token_set:
         # A more robust check for `rm -rf /` is needed here.
         # For now, this is a simple check.
         warnings.append("The command 'rm -rf /' will delete all files on your system.")
 
     # Check for downloading and executing scripts
-    if any(cmd in tokens for cmd in ["curl", "wget"]):
-        if "|" in command_string and any(shell in tokens for shell in ["bash", "sh", "python", "python3", "perl", "ruby", "node", "php"]):
+    if not DOWNLOADERS.isdisjoint(token_set):
+        if "|" in command_string and not INTERPRETERS.isdisjoint(token_set):
             warnings.append("Downloading and executing a script from the internet can be dangerous.")
         
         # Check for specific malicious patterns
         if "|" in command_string:
             # Look for patterns like "wget url | python3 script.py"
             for i, token in enumerate(tokens):
-                if token in ["curl", "wget"] and i + 1 < len(tokens):
+                if token in DOWNLOADERS and i + 1 < len(tokens):
                     url = tokens[i + 1]
-                    if any(ext in url.lower() for ext in [".py", ".sh", ".bash", ".pl", ".rb", ".js", ".php"]):
+                    lowered = url.lower()
+                    if _SCRIPT_EXTENSION_RE.search(lowered):
                         warnings.append(f"WARNING: This command downloads a script file ({url}) and pipes it to an interpreter. This could execute malicious code!")
-                    elif "attacker" in url.lower() or "malware" in url.lower() or "evil" in url.lower():
+                    elif _SUSPICIOUS_URL_RE.search(lowered):
                         warnings.append(f"WARNING: This command downloads from a suspicious URL ({url}) and pipes it to an interpreter. This is likely malicious!")
 
-    if ">" in tokens and "/dev/null" in tokens:
+    if ">" in token_set and "/dev/null" in token_set:
         warnings.append("Redirecting output to /dev/null will hide all output and errors.")
 
-    if ":(){ :|:& };:" in command_string:
+    if FORK_BOMB in command_string:
         warnings.append("This is a fork bomb and will likely crash your system.")
 
-    # Sensitive file reads
-    sensitive_paths = {
-        "/etc/shadow": "Contains password hashes for system users (highly sensitive)",
-        "/etc/passwd": "Contains user account information (less sensitive but still private)",
-        "~/.ssh/id_rsa": "Private SSH key (highly sensitive)",
-        "~/.ssh/id_ed25519": "Private SSH key (highly sensitive)",
-        "/root/.ssh/id_rsa": "Root's private SSH key (highly sensitive)",
-    }
-    read_commands = {"cat", "less", "more", "head", "tail", "sed", "awk", "grep", "cut"}
-    if any(cmd in tokens for cmd in read_commands):
+    # Sensitive file reads; tokens are only walked when one of the paths is present
+    if not READ_COMMANDS.isdisjoint(token_set) and not token_set.isdisjoint(SENSITIVE_PATHS):
         for tok in tokens:
-            if tok in sensitive_paths:
-                warnings.append(f"Reading sensitive file: {tok}. {sensitive_paths[tok]}.")
+            if tok in SENSITIVE_PATHS:
+                warnings.append(f"Reading sensitive file: {tok}. {SENSITIVE_PATHS[tok]}.")
 
-    return warnings
+    return tuple(warnings)
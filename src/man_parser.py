@@ -2,26 +2,135 @@ import subprocess
 import sys
 import re
 import os
+import json
+import shutil
+import threading
+from functools import lru_cache, wraps
+
+# Parsed help/details are cached per user, keyed on the command binary's mtime
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "explain-cli", "manpages",
+)
+
+# Part of every disk cache stamp; bump when the parsers or the cached value
+# format change so entries written by older versions are ignored
+CACHE_VERSION = 2
+
+# Prefixes of the messages returned when a lookup fails; such results are
+# never written to the disk cache
+_LOOKUP_ERROR_PREFIXES = (
+    "This tool is designed for Linux",
+    "Security error:",
+    "Command not found:",
+    "Could not find help",
+)
+
+# Bounds on _extract_flags' work for pathological help/man text; well above
+# the largest real pages (gcc's man page is ~20k lines, ~1.5k flags)
+MAX_FLAG_SCAN_LINES = 50000
+MAX_EXTRACTED_FLAGS = 4096
+
+# Help and man lookups are only attempted on Linux
+_IS_LINUX = sys.platform == "linux"
+
+# Patterns used per line of help/man text, compiled once
+_RE_COMMAND_NAME = re.compile(r'[a-zA-Z0-9._-]+')
+_RE_NAME = re.compile(r'NAME\n\s*(.*)')
+_RE_DESC = re.compile(r'DESCRIPTION\n\s*(.*)')
+_RE_SUBCMD_INDENTED = re.compile(r'^\s+[a-zA-Z][a-zA-Z0-9_-]*\s{2,}')
+_RE_SUBCMD_DASH = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*\s+-')
+_RE_SUBCMD_CAPITAL = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*\s+[A-Z]')
+_RE_SUBCMD_WORD = re.compile(r'^\s*[a-zA-Z][a-zA-Z0-9_-]*\s+')
+_RE_FLAG_PAIR = re.compile(r"^\s*(?:([\-]{1,2}[A-Za-z0-9][^,\s]*)\s*,\s*)?([\-]{1,2}[A-Za-z0-9][^\s]*)(?:\s+(.*))?$")
+_RE_FLAG_SINGLE = re.compile(r"^\s*([\-]{1,2}[A-Za-z0-9])\s{2,}(.*)$")
+_RE_FLAG_COMBINED = re.compile(r"^\s*([\-]{1,2}[A-Za-z0-9]+[A-Z]?)\s+(.*)$")
+_RE_FLAG_INLINE = re.compile(r'([\-]{1,2}[A-Za-z0-9]+[A-Z]?)\s+([A-Z][^\.]*\.?)')
+_RE_DESC_SPLIT = re.compile(r"\s{2,}|\.$")
+_RE_NORMALIZE = re.compile(r"\[.*?\]|=.+")
+_RE_PLACEHOLDER = re.compile(r'<[^>]*>')
 
 def _validate_command_name(command):
     """Validate command name to prevent injection attacks."""
-    # Only allow alphanumeric characters, hyphens, underscores, and dots
-    if not re.match(r'^[a-zA-Z0-9._-]+$', command):
+    # Only allow alphanumeric characters, hyphens, underscores, and dots. This
+    # also rules out path separators (traversal) and shell metacharacters
+    # (command chaining)
+    if not _RE_COMMAND_NAME.fullmatch(command):
         raise ValueError(f"Invalid command name: {command}")
-    
-    # Prevent path traversal
-    if '/' in command or '\\' in command:
-        raise ValueError(f"Command name cannot contain path separators: {command}")
-    
-    # Prevent command chaining
-    if any(char in command for char in [';', '&', '|', '`', '$', '(', ')', '<', '>']):
-        raise ValueError(f"Command name contains dangerous characters: {command}")
-    
     return command
 
+def _binary_stamp(command):
+    """Return a string identifying the installed binary for `command`, or None."""
+    path = shutil.which(command)
+    if not path:
+        return None
+    try:
+        return f"{CACHE_VERSION}:{path}:{os.stat(path).st_mtime_ns}"
+    except OSError:
+        return None
+
+def _load_cached(kind, command):
+    """Return (stamp, value) for a disk-cached result; value is None on a miss."""
+    try:
+        command = _validate_command_name(command)
+    except ValueError:
+        return None, None
+    stamp = _binary_stamp(command)
+    if stamp is None:
+        return None, None
+    try:
+        with open(os.path.join(CACHE_DIR, f"{command}.{kind}.json"), "r") as f:
+            entry = json.load(f)
+        if entry["stamp"] == stamp:
+            return stamp, entry["value"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return stamp, None
+
+def _store_cached(kind, command, stamp, value):
+    """Write a result to the disk cache, ignoring any filesystem errors."""
+    path = os.path.join(CACHE_DIR, f"{command}.{kind}.json")
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Unique per thread too: API server threads can store the same command
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"stamp": stamp, "value": value}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def _cached(kind, finish=None, persist=None):
+    """Memoize a `func(command)` lookup in memory and on disk.
+
+    Disk entries are only written for commands that resolve to a binary, and
+    are invalidated when that binary or CACHE_VERSION changes. `finish`, if
+    given, is applied to values loaded from disk; `persist`, if given, decides
+    which results are written to disk at all.
+    """
+    def decorator(func):
+        @lru_cache(maxsize=256)
+        @wraps(func)
+        def wrapper(command):
+            stamp, value = _load_cached(kind, command)
+            if value is not None:
+                return finish(value) if finish else value
+            value = func(command)
+            if stamp is not None and (persist is None or persist(value)):
+                _store_cached(kind, command, stamp, value)
+            return value
+        return wrapper
+    return decorator
+
+def _intern_details(details):
+    """Intern flag and subcommand names so lookups by interned tokens compare by identity."""
+    details["flags"] = {sys.intern(flag): desc for flag, desc in details["flags"].items()}
+    details["subcommands"] = {sys.intern(name): desc for name, desc in details["subcommands"].items()}
+    return details
+
 def _parse_man_page(man_page_text):
-    name_match = re.search(r'NAME\n\s*(.*)', man_page_text)
-    description_match = re.search(r'DESCRIPTION\n\s*(.*)', man_page_text)
+    name_match = _RE_NAME.search(man_page_text)
+    description_match = _RE_DESC.search(man_page_text)
 
     summary = ""
     if name_match:
@@ -36,7 +145,7 @@ def _parse_help_output(help_text):
     return "\n".join(help_text.splitlines()[:10])
 
 def get_command_help(command):
-    if sys.platform != "linux":
+    if not _IS_LINUX:
         return "This tool is designed for Linux. Cannot fetch command help on other platforms."
 
     # Validate command name first
@@ -45,10 +154,8 @@ def get_command_help(command):
     except ValueError as e:
         return f"Security error: {e}"
 
-    # Check if command exists
-    try:
-        subprocess.run(["which", command], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Check if command exists; a PATH lookup, no `which` process
+    if shutil.which(command) is None:
         return f"Command not found: {command}"
 
     # Try `--help` first, as it's more universally available than `man`
@@ -59,93 +166,152 @@ def get_command_help(command):
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass # Fall through to man if --help fails
 
-    if sys.platform == "linux":
-        try:
-            # Try to get help from `man`
-            result = subprocess.run(["man", command], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                return _parse_man_page(result.stdout)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+    try:
+        # Try to get help from `man`
+        result = subprocess.run(["man", command], capture_output=True, text=True, timeout=5)
+        if result.returncode == 0:
+            return _parse_man_page(result.stdout)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        pass
 
     return f"Could not find help for command: {command}"
 
 
 def _extract_summary(help_text: str) -> str:
-    lines = [line.strip() for line in help_text.splitlines() if line.strip()]
-    if not lines:
-        return ""
-    # Prefer NAME or the first non-usage line
-    for i, line in enumerate(lines[:8]):
-        if not line.lower().startswith(("usage", "synopsis")):
+    # Prefer NAME or the first non-usage line among the first 8 non-blank lines;
+    # only those are stripped, not the whole help text
+    first = None
+    seen = 0
+    for raw in help_text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        # Lowercase just the prefix that is compared, not the whole line
+        if not line[:8].lower().startswith(("usage", "synopsis")):
             return line
-    return lines[0]
+        if first is None:
+            first = line
+        seen += 1
+        if seen == 8:
+            break
+    return first or ""
+
+
+# Subcommands added for every command unless its help/man text defines them
+_COMMON_SUBCOMMANDS = {
+    "show": "Display information",
+    "list": "List items",
+    "ps": "List processes/containers",
+    "status": "Show status information",
+    "start": "Start service/process",
+    "stop": "Stop service/process",
+    "restart": "Restart service/process",
+    "reload": "Reload configuration",
+    "enable": "Enable service/feature",
+    "disable": "Disable service/feature",
+    "add": "Add item",
+    "remove": "Remove item",
+    "delete": "Delete item",
+    "create": "Create item",
+    "destroy": "Destroy item",
+    "up": "Bring up interface/service",
+    "down": "Bring down interface/service"
+}
+
+# find flags that are often not well-parsed from man pages
+_FIND_FLAGS = {
+    "-mtime": "File's data was last modified n*24 hours ago",
+    "-mmin": "File's data was last modified n minutes ago", 
+    "-atime": "File was last accessed n*24 hours ago",
+    "-amin": "File was last accessed n minutes ago",
+    "-ctime": "File's status was last changed n*24 hours ago",
+    "-cmin": "File's status was last changed n minutes ago",
+    "-size": "File uses n units of space",
+    "-user": "File is owned by user uname",
+    "-group": "File belongs to group gname",
+    "-perm": "File's permission bits are exactly mode",
+    "-name": "Base of file name matches shell pattern pattern",
+    "-type": "File is of type c",
+    "-exec": "Execute command",
+    "-executable": "Matches files which are executable",
+    "-readable": "Matches files which are readable",
+    "-writable": "Matches files which are writable",
+    "-empty": "File is empty and is either a regular file or a directory",
+    "-delete": "Delete files",
+    "-print": "Print the full file name",
+    "-ls": "List current file in ls -dils format"
+}
+
+# Descriptions for common subcommands, keyed by subcommand
+_SMART_DESCRIPTIONS = {
+    # Network-related subcommands
+    "link": "Network device configuration",
+    "interface": "Network device configuration",
+    "address": "Protocol address management",
+    "addr": "Protocol address management",
+    "route": "Routing table management",
+    "routing": "Routing table management",
+    "neighbor": "Neighbor/ARP table management",
+    "neighbour": "Neighbor/ARP table management",
+    "arp": "Neighbor/ARP table management",
 
+    # Common action subcommands
+    "show": "Display information",
+    "display": "Display information",
+    "list": "Display information",
+    "status": "Show status information",
+    "state": "Show status information",
+    "start": "Start service/interface",
+    "up": "Start service/interface",
+    "stop": "Stop service/interface",
+    "down": "Stop service/interface",
+    "restart": "Restart/reload service",
+    "reload": "Restart/reload service",
+    "enable": "Enable service/feature",
+    "on": "Enable service/feature",
+    "disable": "Disable service/feature",
+    "off": "Disable service/feature",
+
+    # Git-specific subcommands
+    "push": "Update remote refs along with associated objects",
+    "pull": "Fetch from and integrate with another repository",
+    "commit": "Record changes to the repository",
+    "clone": "Clone a repository into a new directory",
+    "add": "Add file contents to the index",
+    "branch": "List, create, or delete branches",
+    "merge": "Join two or more development histories",
+    "fetch": "Download objects and refs from another repository",
+}
 
 def _get_smart_description(subcmd: str) -> str:
     """Generate smart descriptions for common subcommands based on context."""
-    # Network-related subcommands
-    if subcmd in ["link", "interface"]:
-        return "Network device configuration"
-    elif subcmd in ["address"]:
-        return "Protocol address management"
-    elif subcmd in ["addr"]:
-        return "Protocol address management"
-    elif subcmd in ["route", "routing"]:
-        return "Routing table management"
-    elif subcmd in ["neighbor", "neighbour", "arp"]:
-        return "Neighbor/ARP table management"
-    
-    # Common action subcommands
-    elif subcmd in ["show", "display", "list"]:
-        return "Display information"
-    elif subcmd in ["status", "state"]:
-        return "Show status information"
-    elif subcmd in ["start", "up"]:
-        return "Start service/interface"
-    elif subcmd in ["stop", "down"]:
-        return "Stop service/interface"
-    elif subcmd in ["restart", "reload"]:
-        return "Restart/reload service"
-    elif subcmd in ["enable", "on"]:
-        return "Enable service/feature"
-    elif subcmd in ["disable", "off"]:
-        return "Disable service/feature"
-    
-    # Git-specific subcommands
-    elif subcmd in ["push"]:
-        return "Update remote refs along with associated objects"
-    elif subcmd in ["pull"]:
-        return "Fetch from and integrate with another repository"
-    elif subcmd in ["commit"]:
-        return "Record changes to the repository"
-    elif subcmd in ["clone"]:
-        return "Clone a repository into a new directory"
-    elif subcmd in ["add"]:
-        return "Add file contents to the index"
-    elif subcmd in ["branch"]:
-        return "List, create, or delete branches"
-    elif subcmd in ["merge"]:
-        return "Join two or more development histories"
-    elif subcmd in ["fetch"]:
-        return "Download objects and refs from another repository"
-    
-    # Generic fallback
-    else:
+    description = _SMART_DESCRIPTIONS.get(subcmd)
+    if description is None:
+        # Generic fallback
         return f"Subcommand: {subcmd}"
+    return description
 
 def _extract_subcommands(help_text: str) -> dict:
     """Extract subcommands and their descriptions from help/man text using multiple heuristics.
     
     Returns a dict mapping subcommand to description.
     """
-    subcommands = {}
     lines = help_text.splitlines()
-    
-    # Heuristic 1: Look for OBJECT definitions (ip, ss, etc.)
+    # One pass runs all three heuristics. Each keeps its own dict, merged in
+    # heuristic order below, so later heuristics still win as when they ran
+    # as separate passes
+    object_subcommands = {}
+    listed_subcommands = {}
+    section_subcommands = {}
+    in_commands_section = False
+
     for i, line in enumerate(lines):
         line_stripped = line.strip()
-        
+        if not line_stripped:
+            # No heuristic matches or changes state on a blank line
+            continue
+
+        # Heuristic 1: Look for OBJECT definitions (ip, ss, etc.)
         if "OBJECT" in line_stripped and ":=" in line_stripped and "{" in line_stripped:
             # Extract subcommands from the OBJECT line and continuation lines
             j = i
@@ -162,239 +328,164 @@ def _extract_subcommands(help_text: str) -> dict:
                 for subcmd in subcmd_list.split("|"):
                     subcmd = subcmd.strip()
                     if subcmd and len(subcmd) > 1:
-                        subcommands[subcmd] = _get_smart_description(subcmd)
+                        object_subcommands[subcmd] = _get_smart_description(subcmd)
                         # Add common aliases
                         if subcmd == "address":
-                            subcommands["addr"] = _get_smart_description("addr")
-    
-    # Heuristic 2: Look for indented subcommand lines (git, docker, etc.)
-    for line in lines:
-        line_stripped = line.strip()
-        
+                            object_subcommands["addr"] = _get_smart_description("addr")
+
+        # Heuristic 2: Look for indented subcommand lines (git, docker, etc.)
         # Pattern: "   subcommand     description" (indented with multiple spaces)
-        if re.match(r'^\s+[a-zA-Z][a-zA-Z0-9_-]*\s{2,}', line):
+        if _RE_SUBCMD_INDENTED.match(line):
             parts = line_stripped.split(None, 1)
             if len(parts) >= 2:
                 subcmd = parts[0]
                 desc = parts[1]
                 if len(subcmd) > 1 and len(desc) > 3:
-                    subcommands[subcmd] = desc
+                    listed_subcommands[subcmd] = desc
         
         # Pattern: "subcommand - description" (dash separator)
-        elif re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*\s+-', line_stripped):
+        elif _RE_SUBCMD_DASH.match(line_stripped):
             parts = line_stripped.split(' - ', 1)
             if len(parts) == 2:
                 subcmd = parts[0].strip()
                 desc = parts[1].strip()
                 if len(subcmd) > 1 and len(desc) > 3:
-                    subcommands[subcmd] = desc
+                    listed_subcommands[subcmd] = desc
         
         # Pattern: "subcommand description" (space separator, no dash)
-        elif re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*\s+[A-Z]', line_stripped):
+        elif _RE_SUBCMD_CAPITAL.match(line_stripped):
             parts = line_stripped.split(None, 1)
             if len(parts) >= 2:
                 subcmd = parts[0]
                 desc = parts[1]
                 # Only if it looks like a description (starts with capital, reasonable length)
                 if len(subcmd) > 1 and len(desc) > 5 and desc[0].isupper():
-                    subcommands[subcmd] = desc
-    
-    # Heuristic 3: Look for command lists in sections
-    in_commands_section = False
-    for line in lines:
-        line_stripped = line.strip().lower()
-        
-        # Detect sections that typically contain commands
-        if any(keyword in line_stripped for keyword in ['commands:', 'subcommands:', 'available commands:', 'usage:']):
+                    listed_subcommands[subcmd] = desc
+
+        # Heuristic 3: Look for command lists in sections
+        line_lower = line_stripped.lower()
+        # Detect sections that typically contain commands ('commands:' also
+        # covers 'subcommands:' and 'available commands:')
+        if 'commands:' in line_lower or 'usage:' in line_lower:
             in_commands_section = True
-            continue
-        elif line_stripped and not line_stripped.startswith((' ', '\t')) and ':' in line_stripped:
+        elif ':' in line_lower:
             in_commands_section = False
-            continue
-        
-        # If we're in a commands section, look for command patterns
-        if in_commands_section and line.strip():
-            # Look for lines that start with a word followed by description
-            if re.match(r'^\s*[a-zA-Z][a-zA-Z0-9_-]*\s+', line):
-                parts = line.strip().split(None, 1)
-                if len(parts) >= 2:
-                    subcmd = parts[0]
-                    desc = parts[1]
-                    if len(subcmd) > 1 and len(desc) > 3:
-                        subcommands[subcmd] = desc
+        # If we're in a commands section, look for lines that start with a
+        # word followed by description
+        elif in_commands_section and _RE_SUBCMD_WORD.match(line):
+            parts = line_stripped.split(None, 1)
+            if len(parts) >= 2:
+                subcmd = parts[0]
+                desc = parts[1]
+                if len(subcmd) > 1 and len(desc) > 3:
+                    section_subcommands[subcmd] = desc
+
+    subcommands = {**object_subcommands, **listed_subcommands, **section_subcommands}
     
     # Add common subcommands that might not be explicitly defined
-    common_subcommands = {
-        "show": "Display information",
-        "list": "List items",
-        "ps": "List processes/containers",
-        "status": "Show status information",
-        "start": "Start service/process",
-        "stop": "Stop service/process",
-        "restart": "Restart service/process",
-        "reload": "Reload configuration",
-        "enable": "Enable service/feature",
-        "disable": "Disable service/feature",
-        "add": "Add item",
-        "remove": "Remove item",
-        "delete": "Delete item",
-        "create": "Create item",
-        "destroy": "Destroy item",
-        "up": "Bring up interface/service",
-        "down": "Bring down interface/service"
-    }
-    
-    # Add common find flags that are often not well-parsed from man pages
-    find_flags = {
-        "-mtime": "File's data was last modified n*24 hours ago",
-        "-mmin": "File's data was last modified n minutes ago", 
-        "-atime": "File was last accessed n*24 hours ago",
-        "-amin": "File was last accessed n minutes ago",
-        "-ctime": "File's status was last changed n*24 hours ago",
-        "-cmin": "File's status was last changed n minutes ago",
-        "-size": "File uses n units of space",
-        "-user": "File is owned by user uname",
-        "-group": "File belongs to group gname",
-        "-perm": "File's permission bits are exactly mode",
-        "-name": "Base of file name matches shell pattern pattern",
-        "-type": "File is of type c",
-        "-exec": "Execute command",
-        "-executable": "Matches files which are executable",
-        "-readable": "Matches files which are readable",
-        "-writable": "Matches files which are writable",
-        "-empty": "File is empty and is either a regular file or a directory",
-        "-delete": "Delete files",
-        "-print": "Print the full file name",
-        "-ls": "List current file in ls -dils format"
-    }
-    
-    # Note: find_flags will be handled in get_command_details function
-    
-    # Add common subcommands if they're not already defined
-    for subcmd, desc in common_subcommands.items():
-        if subcmd not in subcommands:
-            subcommands[subcmd] = desc
+    for subcmd, desc in _COMMON_SUBCOMMANDS.items():
+        subcommands.setdefault(subcmd, desc)
     
     return subcommands
 
+def _continuation_lines(lines, j):
+    """Return the stripped indented, non-flag lines starting at lines[j], and the index after them."""
+    parts = []
+    while j < len(lines) and lines[j].startswith(" ") and lines[j].lstrip()[:1] != "-":
+        cont_line = lines[j].strip()
+        if cont_line:
+            parts.append(cont_line)
+        j += 1
+    return parts, j
+
 def _extract_flags(help_text: str) -> dict:
     """Heuristically extract flags and their descriptions from help/man text.
 
     Returns a dict mapping flag (e.g., "-a", "--all", "-sC") to a short description.
+    Scanning stops after MAX_FLAG_SCAN_LINES lines or MAX_EXTRACTED_FLAGS flags.
     """
     flags: dict[str, str] = {}
     lines = help_text.splitlines()
+    if len(lines) > MAX_FLAG_SCAN_LINES:
+        lines = lines[:MAX_FLAG_SCAN_LINES]
     i = 0
-    while i < len(lines):
+    while i < len(lines) and len(flags) < MAX_EXTRACTED_FLAGS:
         line = lines[i].rstrip()
-        if not line or not line.strip():
+        # Every pattern needs a '-'; most man page lines are prose without one
+        if '-' not in line:
             i += 1
             continue
+        # Patterns other than 4 only match lines that start with a flag
+        starts_with_dash = line.lstrip()[:1] == '-'
             
         # Pattern 1: -a, --all               description (or description on next line)
-        m1 = re.match(r"^\s*(?:([\-]{1,2}[A-Za-z0-9][^,\s]*)\s*,\s*)?([\-]{1,2}[A-Za-z0-9][^\s]*)(?:\s+(.*))?$", line)
+        m1 = starts_with_dash and _RE_FLAG_PAIR.match(line)
         if m1:
             flag1, flag2, desc = m1.groups()
             desc = desc.strip() if desc else ""
             
             # Look for description on continuation lines (indented, no leading dash)
-            j = i + 1
-            while j < len(lines) and lines[j].startswith(" ") and not re.match(r"^\s*\-", lines[j]):
-                cont_line = lines[j].strip()
-                if cont_line and not cont_line.startswith("-"):
-                    if desc:
-                        desc += " " + cont_line
-                    else:
-                        desc = cont_line
-                j += 1
+            parts, j = _continuation_lines(lines, i + 1)
+            if parts:
+                desc = " ".join([desc, *parts]) if desc else " ".join(parts)
             
             # Take first sentence, but allow longer descriptions
             if desc:
-                desc = re.split(r"\s{2,}|\.$", desc)[0].strip() or desc
+                desc = _RE_DESC_SPLIT.split(desc)[0].strip() or desc
             
             # Handle both flags, cleaning up commas
             for f in (flag1, flag2):
                 if f:
                     # Clean up trailing commas and normalize
                     clean_flag = f.rstrip(',').strip()
-                    normalized = re.sub(r"\[.*?\]|=.+", "", clean_flag)
+                    normalized = _RE_NORMALIZE.sub("", clean_flag)
                     if desc:  # Only add if we have a description
                         flags[normalized] = desc  # Use direct assignment to ensure we get the description
             i = j
             continue
             
         # Pattern 2: -a    description (simple single flag)
-        m2 = re.match(r"^\s*([\-]{1,2}[A-Za-z0-9])\s{2,}(.*)$", line)
+        m2 = starts_with_dash and _RE_FLAG_SINGLE.match(line)
         if m2:
             f, desc = m2.groups()
             desc = desc.strip()
             
             # Look for continuation lines
-            j = i + 1
-            while j < len(lines) and lines[j].startswith(" ") and not re.match(r"^\s*\-", lines[j]):
-                cont_line = lines[j].strip()
-                if cont_line and not cont_line.startswith("-"):
-                    desc += " " + cont_line
-                j += 1
+            parts, j = _continuation_lines(lines, i + 1)
+            if parts:
+                desc = " ".join([desc, *parts])
             
-            desc = re.split(r"\s{2,}|\.$", desc)[0].strip() or desc
+            desc = _RE_DESC_SPLIT.split(desc)[0].strip() or desc
             flags.setdefault(f, desc)
             i = j
             continue
             
         # Pattern 3: Combined flags like -sC, -sV (more flexible pattern)
-        m3 = re.match(r"^\s*([\-]{1,2}[A-Za-z0-9]+[A-Z]?)\s+(.*)$", line)
+        m3 = starts_with_dash and _RE_FLAG_COMBINED.match(line)
         if m3:
             f, desc = m3.groups()
             desc = desc.strip()
             
             # Look for continuation lines
-            j = i + 1
-            while j < len(lines) and lines[j].startswith(" ") and not re.match(r"^\s*\-", lines[j]):
-                cont_line = lines[j].strip()
-                if cont_line and not cont_line.startswith("-"):
-                    desc += " " + cont_line
-                j += 1
+            parts, j = _continuation_lines(lines, i + 1)
+            if parts:
+                desc = " ".join([desc, *parts])
             
             # Clean up description
-            desc = re.split(r"\s{2,}|\.$", desc)[0].strip() or desc
+            desc = _RE_DESC_SPLIT.split(desc)[0].strip() or desc
             if desc and len(desc) > 3:  # Only add if we have a meaningful description
                 flags[f] = desc
             i = j
             continue
             
         # Pattern 4: Look for flags in man page format like "-sC" or "--script"
-        m4 = re.search(r'([\-]{1,2}[A-Za-z0-9]+[A-Z]?)\s+([A-Z][^\.]*\.?)', line)
+        m4 = _RE_FLAG_INLINE.search(line)
         if m4 and not any(pattern in line.lower() for pattern in ['usage:', 'synopsis:', 'example:']):
             flag, desc = m4.groups()
             desc = desc.strip()
             if desc and len(desc) > 3:
                 flags[flag] = desc
                 
-        # Pattern 5: Look for flags with better description capture
-        m5 = re.match(r'^\s*([\-]{1,2}[A-Za-z0-9]+[A-Z]?)\s+(.*)$', line)
-        if m5 and not any(pattern in line.lower() for pattern in ['usage:', 'synopsis:', 'example:']):
-            flag, desc = m5.groups()
-            desc = desc.strip()
-            
-            # Look for continuation lines
-            j = i + 1
-            while j < len(lines) and lines[j].startswith(" ") and not re.match(r"^\s*\-", lines[j]):
-                cont_line = lines[j].strip()
-                if cont_line and not cont_line.startswith("-"):
-                    desc += " " + cont_line
-                j += 1
-            
-            # Clean up description
-            if desc and len(desc) > 3:
-                # Take first sentence or reasonable length
-                desc = re.split(r'\.\s+', desc)[0].strip()
-                if not desc.endswith('.'):
-                    desc += '.'
-                flags[flag] = desc
-            i = j
-            continue
-            
         i += 1
     
     # Post-process to handle common flag patterns and clean up
@@ -409,7 +500,7 @@ def _extract_flags(help_text: str) -> dict:
         
         # Handle flags with parameters like -p<port>
         if '<' in clean_flag and '>' in clean_flag:
-            clean_flag = re.sub(r'<[^>]*>', '', clean_flag)
+            clean_flag = _RE_PLACEHOLDER.sub('', clean_flag)
         
         # Handle flags with equals like --script=<script>
         if '=' in clean_flag:
@@ -421,66 +512,71 @@ def _extract_flags(help_text: str) -> dict:
     return cleaned_flags
 
 
-def _get_full_help_text(command: str) -> str:
-    """Fetch full help/man text for a command without truncation.
-
-    Tries `command --help` first (uses stdout or stderr regardless of exit code),
-    then falls back to `man`.
-    """
-    if sys.platform != "linux":
-        return "This tool is designed for Linux. Cannot fetch command help on other platforms."
-
-    # Validate command name first
-    try:
-        command = _validate_command_name(command)
-    except ValueError as e:
-        return f"Security error: {e}"
-
-    # Check if command exists
-    try:
-        subprocess.run(["which", command], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return f"Command not found: {command}"
-
-    # Try --help and consider both stdout and stderr, regardless of return code
+def _run_help(command: str) -> str:
+    """Return `command --help` output (stdout and stderr, regardless of exit code), or ""."""
     try:
         result = subprocess.run([command, "--help"], capture_output=True, text=True, timeout=5)
         text = (result.stdout or "") + ("\n" + result.stderr if result.stderr else "")
-        text = text.strip()
-        if text:
-            return text
+        return text.strip()
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return ""
+
 
-    # Fallback to man
+def _run_man(command: str) -> str:
+    """Return the man page for `command`, or "" if there is none."""
     try:
         result = subprocess.run(["man", command], capture_output=True, text=True, timeout=5)
         if result.returncode == 0 and result.stdout:
             return result.stdout
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
+    return ""
 
-    return f"Could not find help for command: {command}"
 
+def _get_help_and_man_text(command: str) -> tuple:
+    """Fetch full help text and the man page for a command without truncation.
+
+    The help text is `command --help` output, falling back to the man page;
+    on failure it is an error message and the man text is "". --help and
+    man each run at most once, concurrently.
+    """
+    if not _IS_LINUX:
+        return "This tool is designed for Linux. Cannot fetch command help on other platforms.", ""
 
+    # Validate command name first
+    try:
+        command = _validate_command_name(command)
+    except ValueError as e:
+        return f"Security error: {e}", ""
+
+    # Check if command exists; a PATH lookup, no `which` process
+    if shutil.which(command) is None:
+        return f"Command not found: {command}", ""
+
+    # --help and man are independent; run man on a thread so the two overlap
+    man_result = []
+    man_thread = threading.Thread(target=lambda: man_result.append(_run_man(command)), daemon=True)
+    man_thread.start()
+    help_text = _run_help(command)
+    man_thread.join()
+    man_text = man_result[0] if man_result else ""
+    return help_text or man_text or f"Could not find help for command: {command}", man_text
+
+
+@_cached("details", _intern_details,
+         persist=lambda details: not details["summary"].startswith(_LOOKUP_ERROR_PREFIXES))
 def get_command_details(command: str) -> dict:
     """Return structured details for a command from --help or man.
 
     Structure: { 'summary': str, 'flags': { flag: description }, 'subcommands': { subcmd: description } }
+
+    Results are memoized and shared between callers, so treat them as read-only.
     """
-    help_text = _get_full_help_text(command)
+    # man is always fetched for a better summary; flags are merged from both sources
+    help_text, man_text = _get_help_and_man_text(command)
     if help_text.startswith("Command not found:") or help_text.startswith("Could not find help"):
         return {"summary": help_text, "flags": {}, "subcommands": {}}
 
-    # Always attempt man for a better summary; also merge flags from both sources
-    man_text = ""
-    try:
-        man_result = subprocess.run(["man", command], capture_output=True, text=True, timeout=5)
-        if man_result.returncode == 0 and man_result.stdout:
-            man_text = man_result.stdout
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-
     summary = ""
     if man_text:
         summary_from_man = _parse_man_page(man_text)
@@ -489,58 +585,31 @@ def get_command_details(command: str) -> dict:
     if not summary:
         summary = _extract_summary(help_text)
 
-    flags = {}
+    # When --help printed nothing, the help text is the man page itself;
+    # parse it once rather than once per source
+    same_text = help_text == man_text
+
     # Merge flags with help taking precedence, then man
     help_flags = _extract_flags(help_text)
-    man_flags = _extract_flags(man_text) if man_text else {}
-    flags.update(man_flags)
-    flags.update(help_flags)
+    man_flags = help_flags if same_text else _extract_flags(man_text) if man_text else {}
+    flags = {**man_flags, **help_flags}
     
-    # Clean up any flags that have other flag names as values (like -T: --tcp)
-    cleaned_flags = {}
-    for flag, desc in flags.items():
-        # If description looks like another flag (starts with -), try to find the real description
-        if desc.startswith('-') and desc in flags:
-            cleaned_flags[flag] = flags[desc]
-        else:
-            cleaned_flags[flag] = desc
-    flags = cleaned_flags
+    # Clean up any flags that have other flag names as values (like -T: --tcp).
+    # Only those few entries are replaced, each with the referenced flag's
+    # original description, rather than copying the whole dict
+    flags.update({flag: flags[desc] for flag, desc in flags.items()
+                  if desc.startswith('-') and desc in flags})
 
     # Extract subcommands
-    subcommands = {}
     help_subcommands = _extract_subcommands(help_text)
-    man_subcommands = _extract_subcommands(man_text) if man_text else {}
-    subcommands.update(man_subcommands)
-    subcommands.update(help_subcommands)
+    man_subcommands = help_subcommands if same_text else _extract_subcommands(man_text) if man_text else {}
+    subcommands = {**man_subcommands, **help_subcommands}
 
     # Add find-specific flags if this is the find command
     if command == "find":
-        find_flags = {
-            "-mtime": "File's data was last modified n*24 hours ago",
-            "-mmin": "File's data was last modified n minutes ago", 
-            "-atime": "File was last accessed n*24 hours ago",
-            "-amin": "File was last accessed n minutes ago",
-            "-ctime": "File's status was last changed n*24 hours ago",
-            "-cmin": "File's status was last changed n minutes ago",
-            "-size": "File uses n units of space",
-            "-user": "File is owned by user uname",
-            "-group": "File belongs to group gname",
-            "-perm": "File's permission bits are exactly mode",
-            "-name": "Base of file name matches shell pattern pattern",
-            "-type": "File is of type c",
-            "-exec": "Execute command",
-            "-executable": "Matches files which are executable",
-            "-readable": "Matches files which are readable",
-            "-writable": "Matches files which are writable",
-            "-empty": "File is empty and is either a regular file or a directory",
-            "-delete": "Delete files",
-            "-print": "Print the full file name",
-            "-ls": "List current file in ls -dils format"
-        }
-        
         # Add find flags, overriding poor man page extractions
-        for flag, desc in find_flags.items():
+        for flag, desc in _FIND_FLAGS.items():
             if flag not in flags or len(flags[flag]) < 10:
                 flags[flag] = desc
 
-    return {"summary": summary or help_text.splitlines()[0], "flags": flags, "subcommands": subcommands}
+    return _intern_details({"summary": summary or help_text.splitlines()[0], "flags": flags, "subcommands": subcommands})
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 
 _SPECIAL_MAP = {
@@ -11,32 +12,41 @@ _SPECIAL_MAP = {
     '|': "alternation (or)",
 }
 
+# Any character that could make text a regex; text without one is a literal
+_META_RE = re.compile(r'[.*+?|()\[\]{}^$\\]')
+_IPV4_RE = re.compile(r"\d+(?:\.\d+){3}")
+# Regex signals: grouping/alternation chars, or an unescaped quantifier or dot
+_REGEX_SIGNAL_RE = re.compile(r'[\[\](){}|]|(?<!\\)[*+?.]')
+# Tokens of a pattern body: a [class], an escaped char, a special char, or a
+# run of literal chars (a lone '[' or trailing backslash is a literal too)
+_TOKEN_RE = re.compile(r'\[([^\]]*)\]|\\(.)|([\^$.*+?|])|([^\[\\^$.*+?|]+|.)', re.DOTALL)
 
+
+# Both helpers are pure functions of their argument, and the same grep patterns
+# recur across API requests, so results are memoized
+@lru_cache(maxsize=512)
 def looks_like_regex(text: str) -> bool:
     if not text:
         return False
     if text == '|' or text.startswith('-'):
         return False
+    if not _META_RE.search(text):
+        return False
     # Paths or URLs: treat as non-regex
     if '/' in text:
         return False
     # Pure IPv4 literal
-    if re.fullmatch(r"\d+(?:\.\d+){3}", text):
+    if '.' in text and _IPV4_RE.fullmatch(text):
         return False
     # Clear regex signals
     if text.startswith('^') or text.endswith('$'):
         return True
-    if any(ch in text for ch in ['[', ']', '(', ')', '|', '{', '}']):
-        return True
-    # Quantifiers not escaped
-    if re.search(r'(?<!\\)[*+?]', text):
-        return True
-    # Unescaped dot used outside of obvious IPs/paths
-    if re.search(r'(?<!\\)\.', text):
-        return True
-    return False
+    # Brackets, braces or alternation, or an unescaped quantifier or dot
+    # (outside of obvious IPs/paths), in one scan
+    return _REGEX_SIGNAL_RE.search(text) is not None
 
 
+@lru_cache(maxsize=512)
 def explain_regex(pattern: str) -> str:
     """Return a concise human explanation for simple regex patterns.
 
@@ -66,28 +76,19 @@ def explain_regex(pattern: str) -> str:
         elif pattern:
             # Plain text or simple metachars
             human = []
-            i = 0
-            while i < len(pattern):
-                ch = pattern[i]
-                nxt = pattern[i+1] if i+1 < len(pattern) else ''
-                if ch == '[':
-                    j = pattern.find(']', i+1)
-                    if j != -1:
-                        cls = pattern[i+1:j]
-                        if cls.startswith('^'):
-                            human.append(f"not any of '{cls[1:]}'")
-                        else:
-                            human.append(f"one of '{cls}'")
-                        i = j + 1
-                        continue
-                if ch in _SPECIAL_MAP:
-                    human.append(_SPECIAL_MAP[ch])
-                elif ch == '\\' and nxt:
-                    human.append(f"literal '{nxt}'")
-                    i += 1
+            for match in _TOKEN_RE.finditer(pattern):
+                cls, escaped, special, literal = match.groups()
+                if cls is not None:
+                    if cls.startswith('^'):
+                        human.append(f"not any of '{cls[1:]}'")
+                    else:
+                        human.append(f"one of '{cls}'")
+                elif escaped is not None:
+                    human.append(f"literal '{escaped}'")
+                elif special is not None:
+                    human.append(_SPECIAL_MAP[special])
                 else:
-                    human.append(f"'{ch}'")
-                i += 1
+                    human.extend(f"'{ch}'" for ch in literal)
             if human:
                 desc = ", ".join(human)
 
@@ -30,8 +30,31 @@ def normalize_signal(sig: str):
     return name
 
 
+def _explanation(flag, name):
+    return f"  {flag}: send {name} ({SIGNAL_NAME_TO_DESC.get(name) or 'signal'})"
+
+
+# Explanations for the canonical spellings, built once: `-9`, `-KILL` and
+# `-SIGKILL` as flags, and `9`, `KILL` and `SIGKILL` as `-s` values
+_FLAG_EXPLANATIONS = {}
+_S_VALUE_EXPLANATIONS = {}
+for _name in SIGNAL_NAME_TO_DESC:
+    for _form in (_name, _name[3:]):
+        _FLAG_EXPLANATIONS[f"-{_form}"] = _explanation(f"-{_form}", _name)
+        _S_VALUE_EXPLANATIONS[_form] = _explanation(f"-s {_form}", _name)
+for _num, _name in SIGNAL_NUMBER_TO_NAME.items():
+    _FLAG_EXPLANATIONS[f"-{_num}"] = _explanation(f"-{_num}", _name)
+    _S_VALUE_EXPLANATIONS[str(_num)] = _explanation(f"-s {_num}", _name)
+
+
 def explain_signal_flag(arg: str, next_arg: str | None = None) -> str | None:
     # Forms: -9, -SIGKILL, --signal SIGKILL (we handle -s in CLI due to generic parsing)
+    explanation = _FLAG_EXPLANATIONS.get(arg)
+    if explanation is None and arg == '-s' and next_arg:
+        explanation = _S_VALUE_EXPLANATIONS.get(next_arg)
+    if explanation is not None:
+        return explanation
+    # Other spellings such as -kill or -09
     if arg.startswith('-') and len(arg) > 1:
         payload = arg[1:]
         # Numeric like -9